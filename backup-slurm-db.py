@@ -18,15 +18,19 @@ Usage:
 """
 
 import argparse
+import atexit
 import gzip
 import glob
 import os
 import re
+import shutil
 import subprocess
 import sys
+import tempfile
 import threading
 import time
 import configparser
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -44,6 +48,33 @@ except NameError:
     SLURM_DB_DEFAULT_BACKUP_DIR = None
 
 
+# Compressors for the backup, in order of preference. Level 1 keeps the
+# compression off the critical path of the dump; the files stay plain gzip.
+GZIP_COMPRESSORS = (['pigz', '-1', '-c'], ['gzip', '-1', '-c'])
+
+# Copy buffer for the in-process gzip fallback
+COPY_CHUNK = 1024 * 1024
+
+
+def drain_stderr(process, maxlen: int = 200):
+    """Collect the last lines of a process's stderr in a background thread.
+    
+    Keeps the stderr pipe empty so the process never blocks on it while the
+    caller is busy with its stdout. Join the returned thread before reading
+    the lines.
+    
+    Returns:
+        (deque of the last stderr lines as bytes, reader thread)
+    """
+    tail = deque(maxlen=maxlen)
+    reader = threading.Thread(
+        target=lambda: tail.extend(iter(process.stderr.readline, b'')),
+        daemon=True
+    )
+    reader.start()
+    return tail, reader
+
+
 class Colors:
     """ANSI color codes"""
     GREEN = '\033[92m'
@@ -70,6 +101,7 @@ class SlurmDatabaseBackup:
         self.verbose = verbose
         self.slurmdbd_conf_path = None
         self.db_config = {}
+        self._option_file = None
         
         if not sys.stdout.isatty():
             Colors.disable()
@@ -83,6 +115,34 @@ class SlurmDatabaseBackup:
         if self.verbose:
             print(f"  {message}")
     
+    def mysql_client_args(self) -> list:
+        """Connection options for mysql/mysqldump, with the credentials in a file.
+        
+        A --password on the command line is visible in the process list for
+        as long as the dump or restore runs. The user and password go into a
+        mode 0600 [client] option file instead, which is removed at exit.
+        
+        Returns:
+            Options to put right after the client name (the option file
+            must come first)
+        """
+        if self._option_file is None:
+            fd, self._option_file = tempfile.mkstemp(prefix='slurm-db-backup-', suffix='.cnf')
+            atexit.register(os.unlink, self._option_file)
+            with os.fdopen(fd, 'w') as f:
+                f.write('[client]\n')
+                for key, value in (('user', self.db_config['storage_user']),
+                                   ('password', self.db_config['storage_pass'])):
+                    if value:
+                        # Quoted so that '#', spaces and the like are taken literally
+                        escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+                        f.write(f'{key}="{escaped}"\n')
+        return [
+            f"--defaults-extra-file={self._option_file}",
+            f"--host={self.db_config['storage_host']}",
+            f"--port={self.db_config['storage_port']}",
+        ]
+    
     def find_slurmdbd_conf(self) -> str:
         """Find slurmdbd.conf file"""
         possible_paths = [
@@ -228,65 +288,72 @@ class SlurmDatabaseBackup:
         # Build mysqldump command
         mysqldump_cmd = [
             'mysqldump',
+            *self.mysql_client_args(),
             '--single-transaction',
             '--quick',
             '--lock-tables=false',
-            f"--host={self.db_config['storage_host']}",
-            f"--port={self.db_config['storage_port']}",
-            f"--user={self.db_config['storage_user']}",
+            '--compress',
+            '--routines',
+            '--triggers',
+            '--events',
         ]
         
-        # Add password if specified
-        if self.db_config['storage_pass']:
-            mysqldump_cmd.append(f"--password={self.db_config['storage_pass']}")
-        
         # Add database name
         mysqldump_cmd.append(self.db_config['storage_loc'])
         
         # Execute backup
         try:
             if self.compress:
-                # Pipe through gzip
+                # Compress the dump stream as it is written
                 dump_process = subprocess.Popen(
                     mysqldump_cmd,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
+                    bufsize=COPY_CHUNK,
                     text=False
                 )
+                dump_stderr_tail, dump_stderr_reader = drain_stderr(dump_process)
+                compressor = next((c for c in GZIP_COMPRESSORS if shutil.which(c[0])), None)
                 
                 with open(backup_path, 'wb') as f:
-                    gzip_process = subprocess.Popen(
-                        ['gzip', '-c'],
-                        stdin=dump_process.stdout,
-                        stdout=f,
-                        stderr=subprocess.PIPE
-                    )
-                    
-                    dump_process.stdout.close()
-                    gzip_stderr = gzip_process.communicate()[1]
-                    dump_stderr = dump_process.communicate()[1]
+                    if compressor:
+                        gzip_process = subprocess.Popen(
+                            compressor,
+                            stdin=dump_process.stdout,
+                            stdout=f,
+                            stderr=subprocess.PIPE
+                        )
+                        dump_process.stdout.close()
+                        gzip_stderr = gzip_process.communicate()[1]
+                    else:
+                        # No gzip binary; compress in-process instead
+                        with gzip.GzipFile(fileobj=f, mode='wb', compresslevel=1) as gz:
+                            shutil.copyfileobj(dump_process.stdout, gz, COPY_CHUNK)
+                        dump_process.stdout.close()
+                    dump_process.wait()
+                    dump_stderr_reader.join()
+                    dump_stderr = b''.join(dump_stderr_tail)
                     
                     if dump_process.returncode != 0:
                         error_msg = dump_stderr.decode() if dump_stderr else "Unknown error"
                         self.log(f"ERROR: mysqldump failed: {error_msg}", Colors.RED)
                         return False, None
                     
-                    if gzip_process.returncode != 0:
+                    if compressor and gzip_process.returncode != 0:
                         error_msg = gzip_stderr.decode() if gzip_stderr else "Unknown error"
-                        self.log(f"ERROR: gzip compression failed: {error_msg}", Colors.RED)
+                        self.log(f"ERROR: {compressor[0]} compression failed: {error_msg}", Colors.RED)
                         return False, None
             else:
                 # Direct output to file
-                with open(backup_path, 'w') as f:
+                with open(backup_path, 'wb') as f:
                     result = subprocess.run(
                         mysqldump_cmd,
                         stdout=f,
-                        stderr=subprocess.PIPE,
-                        text=True
+                        stderr=subprocess.PIPE
                     )
                     
                     if result.returncode != 0:
-                        self.log(f"ERROR: mysqldump failed: {result.stderr}", Colors.RED)
+                        self.log(f"ERROR: mysqldump failed: {result.stderr.decode(errors='replace')}", Colors.RED)
                         return False, None
             
             # Verify backup was created
@@ -507,9 +574,6 @@ class SlurmDatabaseBackup:
         """
         self.log(f"\n{Colors.BOLD}Preparing database for restore...{Colors.RESET}")
         
-        storage_host = self.db_config['storage_host']
-        storage_user = self.db_config['storage_user']
-        storage_pass = self.db_config['storage_pass']
         storage_loc = self.db_config['storage_loc']
         
         cmsh_path = "/cm/local/apps/cmd/bin/cmsh"
@@ -567,10 +631,7 @@ class SlurmDatabaseBackup:
         try:
             # Query processlist for connections to our database
             check_cmd = [
-                'mysql',
-                '-h', storage_host,
-                '-u', storage_user,
-                f"-p{storage_pass}",
+                'mysql', *self.mysql_client_args(),
                 '-N', '-e',
                 f"SELECT Id, User, Host, db, Command, Time FROM information_schema.processlist "
                 f"WHERE db = '{storage_loc}' AND Command != 'Query' AND Id != CONNECTION_ID();"
@@ -605,10 +666,7 @@ class SlurmDatabaseBackup:
                 for conn in blocking_connections:
                     try:
                         kill_cmd = [
-                            'mysql',
-                            '-h', storage_host,
-                            '-u', storage_user,
-                            f"-p{storage_pass}",
+                            'mysql', *self.mysql_client_args(),
                             '-e', f"KILL {conn['id']};"
                         ]
                         result = subprocess.run(kill_cmd, capture_output=True, text=True, timeout=10)
@@ -712,15 +770,10 @@ class SlurmDatabaseBackup:
         # Build mysql command
         mysql_cmd = [
             'mysql',
-            f"--host={self.db_config['storage_host']}",
-            f"--port={self.db_config['storage_port']}",
-            f"--user={self.db_config['storage_user']}",
+            *self.mysql_client_args(),
             '--default-character-set=utf8mb4',
         ]
         
-        if self.db_config['storage_pass']:
-            mysql_cmd.append(f"--password={self.db_config['storage_pass']}")
-        
         # Create database if it doesn't exist
         self.log(f"\n{Colors.BOLD}Ensuring database exists...{Colors.RESET}")
         
@@ -764,10 +817,7 @@ class SlurmDatabaseBackup:
                 """Query database for current table count"""
                 try:
                     check_cmd = [
-                        'mysql',
-                        '-h', self.db_config['storage_host'],
-                        '-u', self.db_config['storage_user'],
-                        f"-p{self.db_config['storage_pass']}",
+                        'mysql', *self.mysql_client_args(),
                         '-N', '-e',
                         f"SELECT COUNT(*) FROM information_schema.tables WHERE table_schema='{self.db_config['storage_loc']}';"
                     ]
@@ -820,26 +870,29 @@ class SlurmDatabaseBackup:
                 zcat_process = subprocess.Popen(
                     ['zcat', backup_file],
                     stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
+                    stderr=subprocess.PIPE,
+                    bufsize=COPY_CHUNK
                 )
+                zcat_stderr_tail, zcat_stderr_reader = drain_stderr(zcat_process)
                 
                 mysql_process = subprocess.Popen(
                     restore_cmd,
                     stdin=zcat_process.stdout,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE
                 )
                 
                 zcat_process.stdout.close()
-                mysql_stdout, mysql_stderr = mysql_process.communicate()
+                mysql_stderr = mysql_process.communicate()[1].decode(errors='replace')
                 zcat_process.wait()
+                zcat_stderr_reader.join()
                 
                 restore_complete[0] = True
                 elapsed_thread.join(timeout=2)
                 
                 if zcat_process.returncode != 0:
-                    self.log("ERROR: Failed to decompress backup file", Colors.RED)
+                    zcat_stderr = b''.join(zcat_stderr_tail).decode(errors='replace').strip()
+                    self.log(f"ERROR: Failed to decompress backup file: {zcat_stderr}", Colors.RED)
                     return False
                 
                 if mysql_process.returncode != 0:
@@ -849,16 +902,15 @@ class SlurmDatabaseBackup:
                         self.log(f"ERROR: MySQL restore failed: {stderr}", Colors.RED)
                         return False
             else:
-                # Plain SQL file
-                mysql_process = subprocess.Popen(
-                    restore_cmd,
-                    stdin=open(backup_file, 'r'),
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                
-                mysql_stdout, mysql_stderr = mysql_process.communicate()
+                # Plain SQL file, read by mysql straight from the fd
+                with open(backup_file, 'rb') as sql_file:
+                    mysql_process = subprocess.Popen(
+                        restore_cmd,
+                        stdin=sql_file,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.PIPE
+                    )
+                    mysql_stderr = mysql_process.communicate()[1].decode(errors='replace')
                 
                 restore_complete[0] = True
                 elapsed_thread.join(timeout=2)
@@ -26,21 +26,104 @@ existing BCM HA MySQL replication configured by cmha-setup.
 Options:
   --reupdate-primary    Re-run only the cmdaemon database update for primary
   --rollback            Rollback migration to original Slurm controllers
+  --fast                Export/import per-table TSV files instead of a SQL dump
+  --physical            Copy the InnoDB tablespaces with mariabackup instead
+  --no-stream           Finish the dump before starting the import
+  --compress-transport  Dump on the StorageHost and send it compressed over SSH
+  --disable-redo-log    Also disable the local InnoDB redo log (MySQL 8.0.21+)
+  --mydumper-threads N  Threads for mydumper/myloader
+  --resume              Continue an interrupted migration from its checkpoint
+  --verify              Check MySQL HA, slurmdbd and sacctmgr after migration
 """
 
 import argparse
+import atexit
 import os
 import sys
 import subprocess
 import re
+import select
+import shlex
+import shutil
+import socket
+import tempfile
 import time
 import threading
 import getpass
+import json
+import heapq
+from concurrent.futures import ALL_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 _CACHED_LOCAL_MYSQL_ADMIN_ARGS: list | None = None
 
+# BCM's cluster management shell, and the fixed command that stops slurmdbd on
+# every node with the slurmaccounting role (used by migration and rollback)
+_CMSH_PATH = "/cm/local/apps/cmd/bin/cmsh"
+_CMSH_STOP_SLURMDBD = "device; foreach -l slurmaccounting (services; stop slurmdbd)"
+
+# Session settings used while replaying the dump into the local DB. The dump is
+# loaded into a freshly created schema, so per-row unique/foreign key checks and
+# per-statement autocommit are pure overhead. The prelude/postlude are written
+# around the dump on the import client's stdin; --init-command applies the
+# checks again in case the client reconnects mid-import.
+_IMPORT_INIT_COMMAND = "SET SESSION unique_checks=0, foreign_key_checks=0"
+_IMPORT_PRELUDE = b"SET autocommit=0;\nSET unique_checks=0;\nSET foreign_key_checks=0;\n"
+_IMPORT_NO_BINLOG = b"SET sql_log_bin=0;\n"
+_IMPORT_POSTLUDE = b"\nCOMMIT;\nSET unique_checks=1;\nSET foreign_key_checks=1;\n"
+
+# mysqldump packs rows into extended INSERTs up to net_buffer_length bytes.
+# 16 MiB (the mysqldump maximum) cuts round-trips on the large job/step tables;
+# override with NET_BUFFER_LENGTH if the source server needs smaller packets.
+_NET_BUFFER_LENGTH = int(os.environ.get("NET_BUFFER_LENGTH", 16 * 1024 * 1024))
+_MAX_ALLOWED_PACKET = "1G"
+_MAX_ALLOWED_PACKET_BYTES = 1 << 30
+
+# Chunk/buffer size for every dump byte stream handled on the Python side
+# (file buffers, pipe buffers, copy loops). Python's default of 8 KiB turns a
+# multi-GB dump into hundreds of thousands of read()/write() syscalls.
+# Also the kernel size of the dump/import pipes (Popen pipesize, Linux
+# F_SETPIPE_SZ; 1 MiB is the default pipe-max-size), up from 64 KiB.
+_IO_CHUNK = 1024 * 1024
+
+# Compressors for the staged dump file, in order of preference. SQL text
+# compresses 3-6x, which cuts the bytes written and read back by the import
+# at a CPU cost well below disk speed.
+_DUMP_CODECS = {
+    "zstd": {"suffix": ".zst", "compress": ["zstd", "-3", "-T2", "-q"],
+             "decompress": ["zstd", "-d", "-q", "-c"]},
+    "pigz": {"suffix": ".gz", "compress": ["pigz", "-1"],
+             "decompress": ["pigz", "-d", "-c"]},
+    "gzip": {"suffix": ".gz", "compress": ["gzip", "-1"],
+             "decompress": ["gzip", "-d", "-c"]},
+}
+
+# With --fast, mysqldump --tab writes <table>.sql/<table>.txt pairs; routines
+# and events go to stdout, which is saved under this name in the same directory.
+_TAB_ROUTINES_FILE = "_routines.sql"
+
+# Number of mysqldump --tab processes run on the StorageHost at once, each on
+# a share of the tables balanced by size (the Slurm job, step and event tables
+# dwarf the rest)
+_TAB_DUMP_JOBS = 4
+
+# mydumper/myloader, when both are installed, replace the single-threaded
+# mysqldump stream. Large tables are exported in chunks of this many rows
+# (primary key ranges), which lets several threads share one table on both
+# the dump and the load side; the files are also split at this many MB.
+_MYDUMPER_ROWS = 1000000
+_MYDUMPER_CHUNK_MB = 256
+
+# Section banner rule used throughout the output
+_SEP = "=" * 65
+
+# Progress of the database migration, kept in the dump directory so that a
+# failed run can be continued with --resume instead of starting over.
+_CHECKPOINT_FILE = "checkpoint.json"
+
 
 def confirm_prompt(prompt: str, default_yes: bool = False) -> bool:
     """Prompt user for confirmation with robust input handling.
@@ -106,6 +189,26 @@ def ensure_root():
         sys.exit(1)
 
 
+@lru_cache(maxsize=1)
+def get_local_short_hostname() -> str:
+    """Get the short hostname of this node ('' if it cannot be determined)."""
+    return socket.gethostname().split('.')[0]
+
+
+# A node line in 'cmha status' output, e.g. "basecm11* -> head2"; the
+# node marked with * is the active one
+_CMHA_NODE_RE = re.compile(r'(\S+?)(\*)?\s*->')
+
+
+@lru_cache(maxsize=1)
+def _cmha_status() -> subprocess.CompletedProcess:
+    """Run 'cmha status' once per script run; HA roles don't change mid-run."""
+    try:
+        return subprocess.run(["cmha", "status"], capture_output=True, text=True)
+    except FileNotFoundError:
+        return subprocess.CompletedProcess(["cmha", "status"], 127, "", "cmha not found")
+
+
 def check_active_headnode() -> bool:
     """Check if this script is running on the active BCM head node.
     
@@ -116,12 +219,10 @@ def check_active_headnode() -> bool:
     Returns:
         True if on active head node (or HA not configured), False otherwise
     """
-    # Get local hostname
-    result = subprocess.run(["hostname", "-s"], capture_output=True, text=True)
-    local_hostname = result.stdout.strip() if result.returncode == 0 else ""
+    local_hostname = get_local_short_hostname()
     
     # Check cmha status
-    result = subprocess.run(["cmha", "status"], capture_output=True, text=True)
+    result = _cmha_status()
     
     if result.returncode != 0:
         # cmha not available - likely single head node, OK to proceed
@@ -129,11 +230,11 @@ def check_active_headnode() -> bool:
     
     # Parse output for active node (marked with *)
     active_node = None
-    for line in result.stdout.split('\n'):
+    for line in result.stdout.splitlines():
         if '->' in line and '*' in line:
             # Format: "hostname* -> ..." - the one with * is active
-            match = re.search(r'(\S+)\*\s*->', line)
-            if match:
+            match = _CMHA_NODE_RE.search(line)
+            if match and match.group(2):
                 active_node = match.group(1)
                 break
     
@@ -156,6 +257,7 @@ def check_active_headnode() -> bool:
     return True
 
 
+@lru_cache(maxsize=1)
 def find_slurmdbd_conf() -> str:
     """Locate slurmdbd.conf using common BCM/Slurm paths."""
     candidates = [
@@ -166,10 +268,22 @@ def find_slurmdbd_conf() -> str:
         "/etc/slurm/slurmdbd.conf",
         "/usr/local/etc/slurmdbd.conf",
     ]
-    for path in candidates:
-        if os.path.exists(path):
-            return path
-    return ""
+    return next((path for path in candidates if os.path.exists(path)), "")
+
+
+# StorageHost/Port/User/Pass/Loc settings in slurmdbd.conf; the value is the
+# rest of the line, as passwords may contain spaces
+_SLURMDBD_CONF_RE = re.compile(
+    r"^[ \t]*(storagehost|storageport|storageuser|storagepass|storageloc)[ \t]*=[ \t]*(.*?)[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_SLURMDBD_CONF_KEYS = {
+    "storagehost": "storage_host",
+    "storageport": "storage_port",
+    "storageuser": "storage_user",
+    "storagepass": "storage_pass",
+    "storageloc": "storage_loc",
+}
 
 
 def parse_slurmdbd_conf(conf_path: str):
@@ -182,26 +296,9 @@ def parse_slurmdbd_conf(conf_path: str):
         "storage_loc": "slurm_acct_db",
     }
 
-    with open(conf_path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip().lower()
-            value = value.strip()
-            if key == "storagehost":
-                cfg["storage_host"] = value
-            elif key == "storageport":
-                cfg["storage_port"] = value
-            elif key == "storageuser":
-                cfg["storage_user"] = value
-            elif key == "storagepass":
-                cfg["storage_pass"] = value
-            elif key == "storageloc":
-                cfg["storage_loc"] = value
+    # Later settings override earlier ones, as in slurmdbd itself
+    for key, value in _SLURMDBD_CONF_RE.findall(Path(conf_path).read_text()):
+        cfg[_SLURMDBD_CONF_KEYS[key.lower()]] = value
 
     missing = [k for k, v in cfg.items() if v is None]
     if missing:
@@ -211,43 +308,51 @@ def parse_slurmdbd_conf(conf_path: str):
     return cfg
 
 
+# Default MySQL/MariaDB socket locations (RHEL, Debian/Ubuntu, upstream),
+# probed locally and on the StorageHost
+_MYSQL_SOCKET_PATHS = (
+    "/var/lib/mysql/mysql.sock",
+    "/var/run/mysqld/mysqld.sock",
+    "/tmp/mysql.sock",
+)
+
+
+@lru_cache(maxsize=1)
 def detect_mysql_socket() -> str:
     """Try to detect a usable local MySQL/MariaDB socket path."""
-    candidates = [
-        "/var/lib/mysql/mysql.sock",
-        "/var/run/mysqld/mysqld.sock",
-        "/tmp/mysql.sock",
-    ]
-    for path in candidates:
-        if os.path.exists(path):
-            return path
-    # Fallback: let mysql decide (may still work with TCP if configured)
-    return ""
+    # Fallback "": let mysql decide (may still work with TCP if configured)
+    return next((path for path in _MYSQL_SOCKET_PATHS if os.path.exists(path)), "")
+
+
+# Example lines:
+# DBUser = "cmdaemon"
+# DBPass = "secret"
+_CMD_CONF_USER_RE = re.compile(r'^\s*DBUser\s*=\s*"([^"]*)"\s*$')
+_CMD_CONF_PASS_RE = re.compile(r'^\s*DBPass\s*=\s*"([^"]*)"\s*$')
 
 
+@lru_cache(maxsize=None)
 def _parse_cmd_conf_db_creds(cmd_conf_path: str = "/cm/local/apps/cmd/etc/cmd.conf") -> dict:
     """Parse BCM cmd.conf for local DB credentials.
 
     We use DBUser/DBPass here because on many BCM systems local MariaDB does not
     allow passwordless root via socket, and the cmdaemon DB user has sufficient
     privileges for schema/user management.
+    
+    The result is cached (every local mysql command needs it); treat it as
+    read-only.
     """
     creds = {"user": None, "pass": None}
     if not os.path.exists(cmd_conf_path):
         return creds
     try:
-        # Example lines:
-        # DBUser = "cmdaemon"
-        # DBPass = "secret"
-        user_re = re.compile(r'^\s*DBUser\s*=\s*"([^"]*)"\s*$')
-        pass_re = re.compile(r'^\s*DBPass\s*=\s*"([^"]*)"\s*$')
-        with open(cmd_conf_path, "r") as f:
+        with open(cmd_conf_path, "r", buffering=65536) as f:
             for line in f:
-                m = user_re.match(line)
+                m = _CMD_CONF_USER_RE.match(line)
                 if m:
                     creds["user"] = m.group(1)
                     continue
-                m = pass_re.match(line)
+                m = _CMD_CONF_PASS_RE.match(line)
                 if m:
                     creds["pass"] = m.group(1)
                     continue
@@ -257,19 +362,75 @@ def _parse_cmd_conf_db_creds(cmd_conf_path: str = "/cm/local/apps/cmd/etc/cmd.co
     return creds
 
 
+# Private directory for the [client] option files holding DB credentials,
+# created on first use and removed at exit
+_MYSQL_OPTION_DIR: str | None = None
+_MYSQL_OPTION_FILES: dict = {}
+
+
+def _mysql_option_file(name: str, options: dict) -> str:
+    """Write a [client] option file (mode 0600) and return its path.
+    
+    Credentials passed as -p<password> show up in the process list of every
+    mysql/mysqldump run; an option file keeps them out of argv. Files are
+    written once per name and reused for the rest of the run.
+    
+    Args:
+        name: Identifies the credential set (e.g. "remote", "local")
+        options: Option names and values, e.g. {"user": ..., "password": ...}
+    """
+    global _MYSQL_OPTION_DIR
+    if name in _MYSQL_OPTION_FILES:
+        return _MYSQL_OPTION_FILES[name]
+    if _MYSQL_OPTION_DIR is None:
+        _MYSQL_OPTION_DIR = tempfile.mkdtemp(prefix="slurmdb-mig-mysql-")
+        atexit.register(shutil.rmtree, _MYSQL_OPTION_DIR, True)
+    
+    path = os.path.join(_MYSQL_OPTION_DIR, f"{name}.cnf")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write("\n".join(_mysql_option_lines(options)) + "\n")
+    _MYSQL_OPTION_FILES[name] = path
+    return path
+
+
+def _mysql_option_lines(options: dict) -> list:
+    """Render options as the lines of a [client] option file."""
+    lines = ["[client]"]
+    for key, value in options.items():
+        if value:
+            # Quoted so that '#', spaces and the like are taken literally
+            escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'{key}="{escaped}"')
+    return lines
+
+
+def _remote_mysql_args(cfg, client: str = "mysql") -> list:
+    """Build the client command prefix for the StorageHost DB from slurmdbd.conf.
+    
+    Args:
+        cfg: Parsed slurmdbd.conf settings
+        client: mysql, mysqldump, ... (all read the [client] group)
+    """
+    option_file = _mysql_option_file("remote", {
+        "host": cfg["storage_host"],
+        "port": cfg["storage_port"],
+        "user": cfg["storage_user"],
+        "password": cfg["storage_pass"],
+    })
+    # Must be the first option; system option files are still read
+    return [client, f"--defaults-extra-file={option_file}"]
+
+
 def _local_mysql_base_args(socket_path: str | None = None) -> list:
     """Build base mysql CLI args for local MariaDB/MySQL, including auth if available."""
     mysql_base = ["mysql"]
+    creds = _parse_cmd_conf_db_creds()
+    if creds.get("user") or creds.get("pass"):
+        option_file = _mysql_option_file("local", {"user": creds["user"], "password": creds["pass"]})
+        mysql_base.append(f"--defaults-extra-file={option_file}")
     if socket_path:
         mysql_base.extend(["--socket", socket_path])
-
-    creds = _parse_cmd_conf_db_creds()
-    if creds.get("user"):
-        mysql_base.extend(["-u", creds["user"]])
-    if creds.get("pass"):
-        # Note: passing password on CLI can be visible to process listing.
-        # This is consistent with existing script patterns for remote DB access.
-        mysql_base.append(f"-p{creds['pass']}")
     return mysql_base
 
 
@@ -303,7 +464,7 @@ def _local_mysql_admin_base_args(socket_path: str | None = None) -> list:
         mysql_base.extend(["--socket", socket_path])
     probe_root = subprocess.run(
         mysql_base + ["-u", "root", "-e", "SELECT 1;"],
-        capture_output=True, text=True
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
     )
     if probe_root.returncode == 0:
         _CACHED_LOCAL_MYSQL_ADMIN_ARGS = mysql_base + ["-u", "root"]
@@ -315,7 +476,8 @@ def _local_mysql_admin_base_args(socket_path: str | None = None) -> list:
         raise RuntimeError(
             "No MySQL root password provided. Cannot perform GRANT/ALTER USER on local DB."
         )
-    _CACHED_LOCAL_MYSQL_ADMIN_ARGS = mysql_base + ["-u", "root", f"-p{root_pw}"]
+    option_file = _mysql_option_file("local-root", {"user": "root", "password": root_pw})
+    _CACHED_LOCAL_MYSQL_ADMIN_ARGS = ["mysql", f"--defaults-extra-file={option_file}"] + mysql_base[1:]
     return _CACHED_LOCAL_MYSQL_ADMIN_ARGS
 
 
@@ -332,7 +494,7 @@ def preflight_local_mysql_admin() -> None:
     # Verify the chosen auth path can actually execute something
     probe = subprocess.run(
         mysql_admin + ["-N", "-e", "SELECT 1;"],
-        capture_output=True, text=True
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
     )
     if probe.returncode != 0:
         raise RuntimeError(
@@ -343,23 +505,131 @@ def preflight_local_mysql_admin() -> None:
     print("  ✓ Local MySQL admin preflight OK (GRANT/ALTER steps should succeed later).")
 
 
-def run_ssh(host: str, cmd: str, timeout: int = 30) -> subprocess.CompletedProcess:
-    """Run a command on a remote host via SSH."""
-    ssh_cmd = [
-        "ssh",
-        "-o", "StrictHostKeyChecking=no",
-        "-o", "ConnectTimeout=5",
-        host,
-        cmd,
-    ]
+_SSH_OPTIONS = ["-o", "StrictHostKeyChecking=no", "-o", "ConnectTimeout=5"]
+_SSH_CONTROL_DIR: str | None = None
+# Host -> lock held while that host's master is being started. _SSH_LOCK only
+# guards the control dir and this dict, so masters to different hosts start
+# in parallel and an unreachable host only holds up its own callers.
+_SSH_MASTERS: dict = {}
+_SSH_LOCK = threading.Lock()
+
+
+def _close_ssh_masters() -> None:
+    """Shut down persistent SSH master connections opened by _ssh_control_args()."""
+    for host in list(_SSH_MASTERS):
+        subprocess.run(
+            ["ssh", "-o", f"ControlPath={_SSH_CONTROL_DIR}/%C", "-O", "exit", host],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+    if _SSH_CONTROL_DIR:
+        shutil.rmtree(_SSH_CONTROL_DIR, ignore_errors=True)
+
+
+def _ssh_control_args(host: str) -> list:
+    """Return ssh options that reuse one persistent master connection per host.
+    
+    The master is started explicitly (ssh -fN) with its stdio on /dev/null.
+    Letting the first command become the master with ControlPersist would
+    leave the backgrounded master holding that command's stdout/stderr pipes,
+    and subprocess.run() would block until ControlPersist expires. If the
+    master cannot be started, ssh falls back to a direct connection.
+    """
+    global _SSH_CONTROL_DIR
+    with _SSH_LOCK:
+        if _SSH_CONTROL_DIR is None:
+            _SSH_CONTROL_DIR = tempfile.mkdtemp(prefix="slurmdb-mig-ssh-")
+            atexit.register(_close_ssh_masters)
+        host_lock = _SSH_MASTERS.get(host)
+        start_master = host_lock is None
+        if start_master:
+            host_lock = _SSH_MASTERS[host] = threading.Lock()
+            host_lock.acquire()
+    control = ["-o", f"ControlPath={_SSH_CONTROL_DIR}/%C"]
+    if not start_master:
+        # Another thread may still be starting this host's master; wait for it
+        with host_lock:
+            pass
+        return control + ["-o", "ControlMaster=no"]
+    try:
+        subprocess.run(
+            ["ssh"] + _SSH_OPTIONS + control + [
+                "-o", "ControlMaster=yes", "-o", "ControlPersist=600", "-f", "-N", host,
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=30,
+        )
+    except subprocess.TimeoutExpired:
+        pass
+    finally:
+        host_lock.release()
+    return control + ["-o", "ControlMaster=no"]
+
+
+def run_ssh(host: str, cmd: str, timeout: int = 30,
+            stdin_bytes: bytes | None = None, capture: bool = True) -> subprocess.CompletedProcess:
+    """Run a command on a remote host via SSH (over a shared master connection).
+    
+    stdout/stderr are returned as bytes: most callers only look at the exit
+    status, the others decode what they parse or print.
+    
+    Args:
+        host: Remote host
+        cmd: Remote command line
+        timeout: Seconds to wait (None = no limit)
+        stdin_bytes: Sent to the remote command's stdin (e.g. SQL for mysql),
+            which keeps it out of the remote command line and its quoting
+        capture: False for probes that only need the exit status
+    """
+    ssh_cmd = ["ssh"] + _SSH_OPTIONS + _ssh_control_args(host) + [host, cmd]
     return subprocess.run(
         ssh_cmd,
-        capture_output=True,
-        text=True,
+        input=stdin_bytes,
+        stdin=None if stdin_bytes is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+        stderr=subprocess.PIPE if capture else subprocess.DEVNULL,
         timeout=timeout,
     )
 
 
+def _sql_str(value: str) -> str:
+    """Quote value as an SQL string literal (for passwords and user names).
+    
+    Backslashes and quotes are escaped, so a password containing them can
+    neither break nor alter the statement it is put in.
+    """
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def _run_sql(mysql_args: list, sql: str) -> subprocess.CompletedProcess:
+    """Run SQL through a local mysql client, sending it on stdin.
+    
+    Used for statements that carry the Slurm DB password: on stdin it stays
+    out of the process list and out of the "Command failed" error text.
+    """
+    return subprocess.run(
+        mysql_args, input=sql, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+
+
+# Probe run by test_db_connectivity(): server version and the name of one
+# stored procedure (used by test_dump_privileges(), '' if there are none).
+_REMOTE_PROBE_SQL = (
+    "SELECT VERSION(), IFNULL((SELECT ROUTINE_NAME FROM information_schema.routines "
+    "WHERE ROUTINE_SCHEMA=DATABASE() AND ROUTINE_TYPE='PROCEDURE' LIMIT 1), ''), "
+    "IFNULL((SELECT SUM(data_length) FROM information_schema.tables "
+    "WHERE table_schema=DATABASE()), 0);"
+)
+_CACHED_REMOTE_DB_INFO: dict | None = None
+
+# The client host in "Access denied for user 'slurm'@'hostname'"
+_DENIED_HOST_RE = re.compile(r"@'([^']+)'")
+
+# The connection id in "Unknown thread id: 12" / "You are not owner of thread 12"
+_KILL_FAILED_ID_RE = re.compile(r"thread (?:id: )?(\d+)")
+
+
 def test_db_connectivity(cfg) -> tuple:
     """Test if we can connect to the remote database from this host.
     
@@ -367,18 +637,14 @@ def test_db_connectivity(cfg) -> tuple:
         (success: bool, error_type: str, error_message: str)
         error_type can be: 'none', 'host_denied', 'auth_failed', 'connection_failed', 'other'
     """
-    storage_host = cfg["storage_host"]
-    storage_user = cfg["storage_user"]
-    storage_pass = cfg["storage_pass"]
     storage_loc = cfg["storage_loc"]
     
-    # Try a simple connection test
+    # Connection test. The same round-trip collects what the later preflight
+    # steps need from the server, so they don't open connections of their own.
     cmd = [
-        "mysql",
-        "-h", storage_host,
-        "-u", storage_user,
-        f"-p{storage_pass}",
-        "-e", "SELECT 1;",
+        *_remote_mysql_args(cfg),
+        "-N", "-B",
+        "-e", _REMOTE_PROBE_SQL,
         storage_loc,
     ]
     
@@ -389,6 +655,14 @@ def test_db_connectivity(cfg) -> tuple:
     )
     
     if result.returncode == 0:
+        global _CACHED_REMOTE_DB_INFO
+        fields = result.stdout.rstrip("\n").split("\t")
+        if len(fields) == 3:
+            _CACHED_REMOTE_DB_INFO = {
+                "version": fields[0],
+                "procedure": fields[1],
+                "data_bytes": int(fields[2]) if fields[2].isdigit() else 0,
+            }
         return (True, 'none', '')
     
     stderr = result.stderr.lower()
@@ -403,8 +677,7 @@ def test_db_connectivity(cfg) -> tuple:
     # This happens when the user exists for some hosts (e.g., localhost) but not for this host
     if "access denied" in stderr and "@'" in stderr:
         # Extract the host from the error message to see if it's different from localhost
-        import re
-        match = re.search(r"@'([^']+)'", result.stderr)
+        match = _DENIED_HOST_RE.search(result.stderr)
         if match:
             denied_host = match.group(1).lower()
             # If the denied host is not localhost, it's a host permission issue
@@ -422,34 +695,56 @@ def test_db_connectivity(cfg) -> tuple:
     return (False, 'other', result.stderr.strip())
 
 
+@lru_cache(maxsize=None)
 def check_remote_mysql_client(host: str) -> tuple:
     """Check if mysql client is available on a remote host.
     
+    Looked up once per host and run; the privilege and connectivity fixes
+    both need it.
+    
     Returns:
         (available: bool, mysql_path: str)
     """
-    # Check common locations
-    result = run_ssh(host, "which mysql 2>/dev/null || command -v mysql 2>/dev/null")
-    if result.returncode == 0 and result.stdout.strip():
-        return (True, result.stdout.strip())
-    
-    # Check if it exists but not in PATH
-    for path in ["/usr/bin/mysql", "/usr/local/bin/mysql"]:
-        result = run_ssh(host, f"test -x {path} && echo {path}")
-        if result.returncode == 0 and result.stdout.strip():
-            return (True, result.stdout.strip())
-    
-    return (False, "")
+    # Look in PATH, then in the usual locations outside it, in one round trip
+    result = run_ssh(
+        host,
+        "command -v mysql 2>/dev/null || "
+        "for p in /usr/bin/mysql /usr/local/bin/mysql; do test -x $p && echo $p && break; done",
+    )
+    output = result.stdout.decode(errors="replace").strip()
+    mysql_path = output.splitlines()[0] if output else ""
+    return (bool(mysql_path), mysql_path)
 
 
+@lru_cache(maxsize=1)
 def get_local_hostname_for_db() -> str:
     """Get the hostname/IP that the database server would see for connections from this host."""
-    result = run_cmd(["hostname", "-f"], capture_output=True, check=False)
-    if result.returncode == 0 and result.stdout.strip():
-        return result.stdout.strip()
+    hostname = socket.gethostname()
+    # Canonical name lookup, as 'hostname -f' does; socket.getfqdn() would
+    # reverse-resolve the address and can return an alias such as localhost.
+    try:
+        canonical = socket.getaddrinfo(hostname, None, flags=socket.AI_CANONNAME)[0][3]
+    except (socket.gaierror, IndexError):
+        canonical = ""
+    return canonical or hostname or "localhost"
+
+
+@lru_cache(maxsize=None)
+def find_remote_mysql_socket(host: str) -> str:
+    """Find a MySQL/MariaDB socket on a remote host.
+    
+    Looked up once per host and run (permission fix, --fast, --physical).
     
-    result = run_cmd(["hostname"], capture_output=True, check=False)
-    return result.stdout.strip() if result.returncode == 0 else "localhost"
+    Returns:
+        Socket path, or "" if none of the common locations exist
+    """
+    # Test them all in one SSH round trip; the first existing one wins
+    result = run_ssh(
+        host,
+        f"for s in {' '.join(_MYSQL_SOCKET_PATHS)}; do test -S \"$s\" && echo \"$s\" && break; done",
+    )
+    found = result.stdout.decode(errors="replace").split()
+    return found[0] if found and found[0] in _MYSQL_SOCKET_PATHS else ""
 
 
 def fix_remote_db_permissions(cfg, mysql_path: str = "/usr/bin/mysql") -> bool:
@@ -471,25 +766,17 @@ def fix_remote_db_permissions(cfg, mysql_path: str = "/usr/bin/mysql") -> bool:
     
     print(f"\n  Attempting to fix database permissions on {storage_host}...")
     
-    # Common socket paths to try
-    socket_paths = [
-        "/var/lib/mysql/mysql.sock",
-        "/var/run/mysqld/mysqld.sock",
-        "/tmp/mysql.sock",
-    ]
-    
-    # Find a working socket on the remote host
-    working_socket = None
-    for socket_path in socket_paths:
-        result = run_ssh(storage_host, f"test -S {socket_path} && echo exists")
-        if result.returncode == 0 and "exists" in result.stdout:
-            working_socket = socket_path
-            break
+    user = _sql_str(storage_user)
+    working_socket = find_remote_mysql_socket(storage_host)
     
     if not working_socket:
         print(f"    ✗ Could not find MySQL socket on {storage_host}")
         return False
     
+    # Read back in the same session that the '%' account now exists, so a
+    # GRANT that "succeeded" without creating it is caught here
+    status_sql = f"SELECT COUNT(*) FROM mysql.user WHERE Host='%' AND User={user};"
+    
     # Build the SQL to grant access from any host
     # We use socket auth as root to update the user permissions.
     #
@@ -497,23 +784,22 @@ def fix_remote_db_permissions(cfg, mysql_path: str = "/usr/bin/mysql") -> bool:
     # SHOW CREATE PROCEDURE/FUNCTION. GRANT ALL on db.* does NOT reliably include
     # SHOW ROUTINE (often treated as global), so we grant it explicitly.
     grant_sql = (
-        f"GRANT ALL PRIVILEGES ON `{storage_loc}`.* TO '{storage_user}'@'%' "
-        f"IDENTIFIED BY '{storage_pass}'; "
-        f"GRANT SHOW ROUTINE ON *.* TO '{storage_user}'@'%'; "
-        f"FLUSH PRIVILEGES;"
+        f"GRANT ALL PRIVILEGES ON `{storage_loc}`.* TO {user}@'%' "
+        f"IDENTIFIED BY {_sql_str(storage_pass)}; "
+        f"GRANT SHOW ROUTINE ON *.* TO {user}@'%'; "
+        f"FLUSH PRIVILEGES; "
+        f"{status_sql}"
     )
     
-    # Escape single quotes for shell
-    grant_sql_escaped = grant_sql.replace("'", "'\"'\"'")
+    # Run as root via socket authentication, with the SQL on stdin so that it
+    # needs no shell quoting (and the password is not on the command line)
+    remote_cmd = f"{mysql_path} -N --socket={working_socket}"
     
-    # Run as root via socket authentication
-    remote_cmd = f"{mysql_path} --socket={working_socket} -e '{grant_sql_escaped}'"
+    print(f"    Running: ssh {storage_host} \"{mysql_path} --socket=... <<< 'GRANT ...'\"")
     
-    print(f"    Running: ssh {storage_host} \"{mysql_path} --socket=... -e 'GRANT ...'\"")
+    result = run_ssh(storage_host, remote_cmd, timeout=60, stdin_bytes=grant_sql.encode())
     
-    result = run_ssh(storage_host, remote_cmd, timeout=60)
-    
-    if result.returncode == 0:
+    if _grant_confirmed(result):
         print(f"    ✓ Granted '{storage_user}'@'%' access to {storage_loc}")
         return True
     else:
@@ -522,24 +808,57 @@ def fix_remote_db_permissions(cfg, mysql_path: str = "/usr/bin/mysql") -> bool:
         
         # Try CREATE USER IF NOT EXISTS with GRANT
         alt_sql = (
-            f"CREATE USER IF NOT EXISTS '{storage_user}'@'%' IDENTIFIED BY '{storage_pass}'; "
-            f"GRANT ALL PRIVILEGES ON `{storage_loc}`.* TO '{storage_user}'@'%'; "
-            f"GRANT SHOW ROUTINE ON *.* TO '{storage_user}'@'%'; "
-            f"FLUSH PRIVILEGES;"
+            f"CREATE USER IF NOT EXISTS {user}@'%' IDENTIFIED BY {_sql_str(storage_pass)}; "
+            f"GRANT ALL PRIVILEGES ON `{storage_loc}`.* TO {user}@'%'; "
+            f"GRANT SHOW ROUTINE ON *.* TO {user}@'%'; "
+            f"FLUSH PRIVILEGES; "
+            f"{status_sql}"
         )
-        alt_sql_escaped = alt_sql.replace("'", "'\"'\"'")
-        remote_cmd = f"{mysql_path} --socket={working_socket} -e '{alt_sql_escaped}'"
+        result = run_ssh(storage_host, remote_cmd, timeout=60, stdin_bytes=alt_sql.encode())
         
-        result = run_ssh(storage_host, remote_cmd, timeout=60)
-        
-        if result.returncode == 0:
+        if _grant_confirmed(result):
             print(f"    ✓ Created '{storage_user}'@'%' with access to {storage_loc}")
             return True
         else:
-            print(f"    ✗ Failed to update permissions: {result.stderr.strip()}")
+            error = result.stderr.decode(errors='replace').strip()
+            if result.returncode == 0:
+                error = f"'{storage_user}'@'%' does not exist after the GRANT"
+            print(f"    ✗ Failed to update permissions: {error}")
             return False
 
 
+def _grant_confirmed(result: subprocess.CompletedProcess) -> bool:
+    """Check that a remote GRANT session succeeded and its status row is positive."""
+    if result.returncode != 0:
+        return False
+    fields = result.stdout.decode(errors="replace").split()
+    return bool(fields) and fields[-1].isdigit() and int(fields[-1]) > 0
+
+
+# Pauses between re-checks after a remote GRANT, which can take a moment to
+# apply on a busy server; about 4 s in total before giving up
+_RETRY_DELAYS = (0.1, 0.3, 0.9, 2.7)
+
+
+def _retry_with_backoff(check, delays=_RETRY_DELAYS) -> tuple:
+    """Call check() until its first element is truthy, pausing delays in between.
+    
+    Args:
+        check: Callable returning a tuple whose first element is the success flag
+        delays: Seconds to wait before each retry
+        
+    Returns:
+        The result of the last call
+    """
+    result = check()
+    for delay in delays:
+        if result[0]:
+            break
+        time.sleep(delay)
+        result = check()
+    return result
+
+
 def ensure_db_connectivity(cfg) -> bool:
     """Ensure we can connect to the remote database, fixing permissions if needed.
     
@@ -588,7 +907,10 @@ def ensure_db_connectivity(cfg) -> bool:
         
         # Try to fix permissions
         if fix_remote_db_permissions(cfg, mysql_path):
-            # Test connectivity again
+            # Test connectivity again. The GRANT session already read the
+            # account back, so the change is live and one attempt is enough;
+            # this login still has to be tried from here, as a more specific
+            # '{user}'@'{host}' row can shadow the '%' one.
             print(f"\n  Re-testing database connectivity...")
             success, _, error_msg = test_db_connectivity(cfg)
             if success:
@@ -620,30 +942,45 @@ def test_dump_privileges(cfg) -> tuple:
     Returns:
         (success: bool, error_message: str)
     """
-    storage_host = cfg["storage_host"]
-    storage_user = cfg["storage_user"]
-    storage_pass = cfg["storage_pass"]
     storage_loc = cfg["storage_loc"]
 
-    # Find one procedure name (Slurm typically has procedures, e.g., get_coord_qos)
-    find_proc_sql = (
-        "SELECT ROUTINE_NAME FROM information_schema.routines "
-        f"WHERE ROUTINE_SCHEMA='{storage_loc}' AND ROUTINE_TYPE='PROCEDURE' "
-        "LIMIT 1;"
+    # Find one procedure name (Slurm typically has procedures, e.g., get_coord_qos).
+    # test_db_connectivity() normally already looked it up.
+    if _CACHED_REMOTE_DB_INFO is not None:
+        return _test_show_create_procedure(cfg, _CACHED_REMOTE_DB_INFO["procedure"])
+
+    # Otherwise look the procedure up and show it in the same session, so the
+    # probe pays for a single connection/auth handshake.
+    probe_sql = (
+        "SET @p = NULL; "
+        "SELECT ROUTINE_NAME INTO @p FROM information_schema.routines "
+        f"WHERE ROUTINE_SCHEMA={_sql_str(storage_loc)} AND ROUTINE_TYPE='PROCEDURE' "
+        "LIMIT 1; "
+        "SET @q = IF(@p IS NULL, 'DO 0', "
+        "CONCAT('SHOW CREATE PROCEDURE `', REPLACE(@p, '`', '``'), '`')); "
+        "PREPARE s FROM @q; EXECUTE s; DEALLOCATE PREPARE s;"
     )
-    find_cmd = [
-        "mysql",
-        "-h", storage_host,
-        "-u", storage_user,
-        f"-p{storage_pass}",
+    probe_cmd = [
+        *_remote_mysql_args(cfg),
+        storage_loc,
         "-N",
-        "-e", find_proc_sql,
+        "-e", probe_sql,
     ]
-    result = subprocess.run(find_cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        return (False, result.stderr.strip() or "Failed to query information_schema.routines")
+    result = subprocess.run(probe_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode == 0:
+        return (True, "")
+
+    return (False, result.stderr.strip() or "Failed to run SHOW CREATE PROCEDURE")
+
+
+def _test_show_create_procedure(cfg, proc_name: str) -> tuple:
+    """Run SHOW CREATE PROCEDURE on proc_name as the configured DB user.
+
+    Returns:
+        (success: bool, error_message: str)
+    """
+    storage_loc = cfg["storage_loc"]
 
-    proc_name = result.stdout.strip()
     if not proc_name:
         # No procedures found; dumping routines should be a no-op.
         return (True, "")
@@ -651,14 +988,11 @@ def test_dump_privileges(cfg) -> tuple:
     # Try SHOW CREATE PROCEDURE on the first procedure we find
     show_sql = f"SHOW CREATE PROCEDURE `{proc_name}`;"
     show_cmd = [
-        "mysql",
-        "-h", storage_host,
-        "-u", storage_user,
-        f"-p{storage_pass}",
+        *_remote_mysql_args(cfg),
         storage_loc,
         "-e", show_sql,
     ]
-    result = subprocess.run(show_cmd, capture_output=True, text=True)
+    result = subprocess.run(show_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
     if result.returncode == 0:
         return (True, "")
 
@@ -699,7 +1033,7 @@ def ensure_dump_privileges(cfg) -> bool:
         return False
 
     print("\nRe-testing dump privileges...")
-    ok, err = test_dump_privileges(cfg)
+    ok, err = _retry_with_backoff(lambda: test_dump_privileges(cfg))
     if ok:
         print("  ✓ Routines dump privileges OK after update")
         return True
@@ -708,25 +1042,33 @@ def ensure_dump_privileges(cfg) -> bool:
     return False
 
 
-def run_cmsh(cmsh_commands: str, check: bool = True) -> subprocess.CompletedProcess:
+@lru_cache(maxsize=1)
+def cmsh_available() -> bool:
+    """Whether cmsh is installed (checked once per script run)."""
+    return os.path.exists(_CMSH_PATH)
+
+
+def run_cmsh(cmsh_commands: str, check: bool = True,
+             timeout: int | None = None) -> subprocess.CompletedProcess:
     """Run cmsh commands and return the result.
     
     Args:
         cmsh_commands: Multi-line string of cmsh commands to execute
         check: If True, raise on non-zero exit code
+        timeout: Seconds to wait for cmsh (None = no limit)
         
     Returns:
         CompletedProcess with stdout/stderr
     """
-    cmsh_path = "/cm/local/apps/cmd/bin/cmsh"
-    if not os.path.exists(cmsh_path):
-        raise RuntimeError(f"cmsh not found at {cmsh_path}")
+    if not cmsh_available():
+        raise RuntimeError(f"cmsh not found at {_CMSH_PATH}")
     
     result = subprocess.run(
-        [cmsh_path],
+        [_CMSH_PATH],
         input=cmsh_commands,
         capture_output=True,
         text=True,
+        timeout=timeout,
     )
     
     if check and result.returncode != 0:
@@ -738,6 +1080,48 @@ def run_cmsh(cmsh_commands: str, check: bool = True) -> subprocess.CompletedProc
     return result
 
 
+# Upper bound for waiting on cmdaemon after 'systemctl stop/start cmd'
+_CMD_WAIT_TIMEOUT = 30
+
+
+def _wait_for_cmdaemon(running: bool, timeout: float = _CMD_WAIT_TIMEOUT) -> bool:
+    """Wait for cmdaemon to be stopped, or to be started and answering cmsh.
+    
+    Used after 'systemctl stop/start cmd' instead of a fixed sleep: returns as
+    soon as the state is reached, and still waits on a slow head node.
+    
+    Args:
+        running: True to wait for a started cmdaemon, False for a stopped one
+        timeout: Seconds to wait at most
+        
+    Returns:
+        True if the state was reached within timeout
+    """
+    deadline = time.monotonic() + timeout
+    while (subprocess.run(["systemctl", "is-active", "--quiet", "cmd"]).returncode == 0) != running:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.1)
+    if not running:
+        return True
+    
+    # The unit is up; cmdaemon is ready once cmsh gets an answer from it
+    while True:
+        try:
+            result = run_cmsh("configurationoverlay\nlist\nquit\n", check=False, timeout=10)
+            if result.returncode == 0 and "Name (key)" in result.stdout:
+                return True
+        except subprocess.TimeoutExpired:
+            pass
+        except RuntimeError:
+            # No cmsh on this node, so nothing here waits for it
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.5)
+
+
+@lru_cache(maxsize=1)
 def get_bcm_headnodes() -> tuple:
     """Get both BCM head node hostnames (primary, secondary).
     
@@ -749,19 +1133,15 @@ def get_bcm_headnodes() -> tuple:
     secondary = None
     
     # Try cmha status first
-    result = subprocess.run(
-        ["cmha", "status"],
-        capture_output=True,
-        text=True,
-    )
+    result = _cmha_status()
     
     if result.returncode == 0:
         # Parse output for both nodes
         # Format: "basecm11* -> head2" - the one with * is active (primary)
-        for line in result.stdout.split('\n'):
+        for line in result.stdout.splitlines():
             if '->' in line:
                 # Extract hostname (before the ->)
-                match = re.search(r'(\S+?)(\*)?\s*->', line)
+                match = _CMHA_NODE_RE.search(line)
                 if match:
                     hostname = match.group(1)
                     is_active = match.group(2) == '*'
@@ -772,12 +1152,12 @@ def get_bcm_headnodes() -> tuple:
     
     # Fallback to local hostname for primary if not found
     if not primary:
-        result = run_cmd(["hostname", "-s"], capture_output=True)
-        primary = result.stdout.strip()
+        primary = get_local_short_hostname()
     
     return (primary, secondary)
 
 
+@lru_cache(maxsize=1)
 def get_primary_bcm_headnode() -> str:
     """Get the primary (active) BCM head node hostname.
     
@@ -788,35 +1168,76 @@ def get_primary_bcm_headnode() -> str:
     return primary
 
 
+@lru_cache(maxsize=1)
+def _query_slurmaccounting_layout() -> tuple | None:
+    """Fetch the slurmaccounting nodes and the overlay list in one cmsh session.
+    
+    The node hostnames are printed first; the overlay list starts with its
+    "Name (key)" header line, which is where the output is split. The
+    result reflects BCM as of the first call.
+    
+    Returns:
+        Tuple of (slurmaccounting node hostnames, overlay list output lines),
+        or None if the session failed or its output could not be split
+    """
+    try:
+        result = run_cmsh(
+            "device\nforeach -l slurmaccounting (get hostname)\n"
+            "configurationoverlay\nlist\nquit\n",
+            check=False, timeout=30,
+        )
+    except Exception:
+        return None
+    if result.returncode != 0:
+        return None
+    
+    lines = result.stdout.splitlines()
+    for i, line in enumerate(lines):
+        if line.strip().startswith('Name (key)'):
+            return [l.strip() for l in lines[:i] if l.strip()], lines[i:]
+    return None
+
+
+@lru_cache(maxsize=1)
 def find_slurmaccounting_overlay() -> str:
     """Find the configuration overlay that has the slurmaccounting role.
     
+    The overlay is looked up once per run (failures are not cached).
+    
     Returns:
         Name of the configuration overlay with slurmaccounting role
         
     Raises:
         RuntimeError if no overlay found with slurmaccounting role
     """
-    # List all overlays and their roles
-    cmsh_cmd = "configurationoverlay\nlist\nquit\n"
-    result = run_cmsh(cmsh_cmd)
+    # List all overlays and their roles (usually already fetched together
+    # with the slurmdbd nodes)
+    layout = _query_slurmaccounting_layout()
+    if layout:
+        overlay_lines = layout[1]
+    else:
+        overlay_lines = run_cmsh("configurationoverlay\nlist\nquit\n").stdout.splitlines()
     
     # Parse output to find overlay with slurmaccounting role
     # Format: "Name (key)  Priority  All head nodes  Nodes  Categories  Roles"
     overlay_name = None
     
-    for line in result.stdout.split('\n'):
+    for line in overlay_lines:
         line = line.strip()
         if not line or line.startswith('Name') or line.startswith('-'):
             continue
         
-        # Check if this line contains "slurmaccounting" in the Roles column
-        if 'slurmaccounting' in line.lower():
-            # First column is the overlay name
-            parts = line.split()
-            if parts:
-                overlay_name = parts[0]
-                break
+        # First column is the overlay name; match the role as a whole token
+        # so an overlay merely *named* like the role is not picked up.
+        parts = line.split()
+        roles = {
+            role.lower()
+            for token in parts[1:]
+            for role in token.split(',')
+        }
+        if 'slurmaccounting' in roles:
+            overlay_name = parts[0]
+            break
     
     if not overlay_name:
         raise RuntimeError(
@@ -827,7 +1248,87 @@ def find_slurmaccounting_overlay() -> str:
     return overlay_name
 
 
-def update_bcm_configuration(primary_headnode: str, skip_confirm: bool = False) -> bool:
+# A 'show' line with one of the fields read_bcm_configuration() needs: the
+# field label, then its value (the last word)
+_CMSH_SHOW_FIELD_RE = re.compile(
+    r"^\s*(nodes|all head nodes|primary|storagehost|storage host)\s.*?(\S+)\s*$",
+    re.IGNORECASE,
+)
+_CMSH_SHOW_FIELDS = {
+    "nodes": "nodes",
+    "all head nodes": "allheadnodes",
+    "primary": "primary",
+    "storagehost": "storagehost",
+    "storage host": "storagehost",
+}
+
+
+def read_bcm_configuration() -> tuple:
+    """Read the slurmaccounting overlay and role settings (read-only).
+    
+    Nothing here depends on the database migration, so main() runs it in
+    the background during the dump and import.
+    
+    Returns:
+        Tuple of (overlay name, {"nodes", "allheadnodes", "primary",
+        "storagehost": current value})
+        
+    Raises:
+        RuntimeError if no overlay found with slurmaccounting role
+    """
+    overlay_name = find_slurmaccounting_overlay()
+    cmsh_show = f"""configurationoverlay
+use {overlay_name}
+show
+roles
+use slurmaccounting
+show
+quit
+"""
+    result = run_cmsh(cmsh_show, check=False, timeout=60)
+    
+    current = {"nodes": "", "allheadnodes": "", "primary": "", "storagehost": ""}
+    for line in result.stdout.splitlines():
+        match = _CMSH_SHOW_FIELD_RE.match(line)
+        if match:
+            current[_CMSH_SHOW_FIELDS[match.group(1).lower()]] = match.group(2)
+    return overlay_name, current
+
+
+def set_accounting_primary(hostname: str) -> tuple:
+    """Set the slurmaccounting 'primary' in the cmdaemon database and read it back.
+    
+    The 'primary' field is stored as JSON in the Roles table's extra_values
+    column and is not settable via cmsh. The UPDATE, its row count and the
+    stored value come back from a single mysql call.
+    
+    Args:
+        hostname: Head node to make the slurmaccounting primary
+        
+    Returns:
+        (success: bool, rows changed: int, stored extra_values: str, error: str);
+        0 rows changed means the value was already set
+    """
+    # json.dumps() gives the same compact form cmdaemon stores, and
+    # escapes the hostname properly
+    extra_values = json.dumps({"ha": True, "primary": hostname}, separators=(",", ":"))
+    sql = (
+        f"UPDATE Roles SET extra_values={_sql_str(extra_values)} "
+        f"WHERE CAST(name AS CHAR)='slurmaccounting'; "
+        f"SELECT ROW_COUNT(), CAST(extra_values AS CHAR) FROM Roles "
+        f"WHERE CAST(name AS CHAR)='slurmaccounting';"
+    )
+    result = subprocess.run(["mysql", "-N", "cmdaemon", "-e", sql], capture_output=True, text=True)
+    if result.returncode != 0:
+        return (False, 0, "", result.stderr.strip())
+    if not result.stdout.strip():
+        return (False, 0, "", "no slurmaccounting role in the Roles table")
+    rows, _, value = result.stdout.strip().partition("\t")
+    return (True, int(rows) if rows.isdigit() else 0, value, "")
+
+
+def update_bcm_configuration(primary_headnode: str, skip_confirm: bool = False,
+                             prefetched: tuple | None = None) -> bool:
     """Update BCM configuration to move slurm accounting to head nodes.
     
     This function:
@@ -842,56 +1343,26 @@ def update_bcm_configuration(primary_headnode: str, skip_confirm: bool = False)
     Args:
         primary_headnode: Hostname of the primary BCM head node
         skip_confirm: If True, don't prompt for confirmation
+        prefetched: Optional result of read_bcm_configuration()
         
     Returns:
         True if configuration was updated successfully
     """
-    print(f"\n{'=' * 65}")
+    print(f"\n{_SEP}")
     print("UPDATING BCM CONFIGURATION VIA CMSH")
-    print('=' * 65)
+    print(_SEP)
     
     # Find the overlay
     print("\nFinding configuration overlay with slurmaccounting role...")
-    overlay_name = find_slurmaccounting_overlay()
+    overlay_name, current = prefetched or read_bcm_configuration()
     print(f"  Found overlay: {overlay_name}")
     
     # Show current configuration
     print(f"\nCurrent configuration:")
-    cmsh_show = f"""configurationoverlay
-use {overlay_name}
-show
-roles
-use slurmaccounting
-show
-quit
-"""
-    result = run_cmsh(cmsh_show, check=False)
-    
-    # Parse and display relevant settings
-    current_nodes = ""
-    current_allheadnodes = ""
-    current_primary = ""
-    current_storagehost = ""
-    
-    in_overlay = False
-    in_role = False
-    
-    for line in result.stdout.split('\n'):
-        line_lower = line.lower().strip()
-        
-        if 'nodes' in line_lower and 'all head nodes' not in line_lower:
-            if 'slurmctl' in line_lower or ',' in line:
-                current_nodes = line.split()[-1] if line.split() else ""
-        if 'all head nodes' in line_lower:
-            current_allheadnodes = line.split()[-1] if line.split() else ""
-        if 'primary' in line_lower and 'primary' == line_lower.split()[0] if line_lower.split() else False:
-            parts = line.split()
-            if len(parts) >= 2:
-                current_primary = parts[-1]
-        if 'storagehost' in line_lower:
-            parts = line.split()
-            if len(parts) >= 2:
-                current_storagehost = parts[-1]
+    current_nodes = current["nodes"]
+    current_allheadnodes = current["allheadnodes"]
+    current_primary = current["primary"]
+    current_storagehost = current["storagehost"]
     
     print(f"  Overlay: {overlay_name}")
     print(f"    Current Nodes: {current_nodes if current_nodes else '(none)'}")
@@ -921,8 +1392,6 @@ quit
     # Parameter names from BCM admin manual:
     #   primaryaccountingserver - sets DbdHost (which node is primary)
     #   storagehost - sets StorageHost (MySQL server)
-    cmsh_path = "/cm/local/apps/cmd/bin/cmsh"
-    
     # Update slurmaccounting role settings
     role_cmd = (f"configurationoverlay; use {overlay_name}; roles; use slurmaccounting; "
                 f"set primaryaccountingserver {primary_headnode}; set storagehost master; commit")
@@ -932,17 +1401,29 @@ quit
     
     print("\nApplying BCM configuration changes...")
     try:
-        # Update role via cmsh (storagehost)
-        result = subprocess.run([cmsh_path, '-c', role_cmd], capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"  ⚠ cmsh role update returned non-zero (may be expected for primaryaccountingserver)")
-        print(f"  ✓ Updated slurmaccounting role: storagehost=master")
-        
-        # Update overlay
-        result = subprocess.run([cmsh_path, '-c', overlay_cmd], capture_output=True, text=True)
-        if result.returncode != 0:
-            raise RuntimeError(f"Overlay update failed: {result.stderr}")
-        print(f"  ✓ Updated overlay: allheadnodes=yes, nodes cleared")
+        # Apply both changes in one cmsh session (one startup and login
+        # instead of two). cmsh carries on after a failed command when it
+        # reads stdin, so its exit status does not tell whether the commits
+        # went through; read the settings back instead. If they did not all
+        # take, redo the changes one by one to find out which part failed.
+        result = run_cmsh(f"{role_cmd}\n{overlay_cmd}\nquit\n".replace("; ", "\n"), check=False)
+        applied = read_bcm_configuration()[1] if result.returncode == 0 else {}
+        if (applied.get("storagehost") == "master" and not applied.get("nodes")
+                and applied.get("allheadnodes", "").lower() == "yes"):
+            print(f"  ✓ Updated slurmaccounting role: storagehost=master")
+            print(f"  ✓ Updated overlay: allheadnodes=yes, nodes cleared")
+        else:
+            # Update role via cmsh (storagehost)
+            result = subprocess.run([_CMSH_PATH, '-c', role_cmd], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if result.returncode != 0:
+                print(f"  ⚠ cmsh role update returned non-zero (may be expected for primaryaccountingserver)")
+            print(f"  ✓ Updated slurmaccounting role: storagehost=master")
+            
+            # Update overlay
+            result = subprocess.run([_CMSH_PATH, '-c', overlay_cmd], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"Overlay update failed: {result.stderr}")
+            print(f"  ✓ Updated overlay: allheadnodes=yes, nodes cleared")
         
         # Update primary directly in cmdaemon database
         # The 'primary' field is stored as JSON in the Roles table's extra_values column
@@ -954,41 +1435,27 @@ quit
         print(f"\n  Stopping cmdaemon before database update...")
         result = subprocess.run(
             ["systemctl", "stop", "cmd"],
-            capture_output=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
             text=True,
             timeout=60
         )
         if result.returncode == 0:
             print(f"  ✓ cmdaemon stopped")
-            time.sleep(2)  # Give cmdaemon time to fully stop and flush state
+            if not _wait_for_cmdaemon(running=False):
+                print(f"  ⚠ Warning: cmdaemon still running after {_CMD_WAIT_TIMEOUT}s")
         else:
             print(f"  ⚠ Warning: Could not stop cmdaemon: {result.stderr}")
             print(f"    Proceeding with database update anyway...")
         
         print(f"  Updating slurmaccounting primary in cmdaemon database...")
-        update_sql = (
-            f"UPDATE Roles SET extra_values='{{\"ha\":true,\"primary\":\"{primary_headnode}\"}}' "
-            f"WHERE CAST(name AS CHAR)='slurmaccounting'"
-        )
-        result = subprocess.run(
-            ["mysql", "cmdaemon", "-e", update_sql],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode != 0:
-            print(f"  ⚠ Warning: Could not update primary in database: {result.stderr}")
+        ok, rows, current_value, error = set_accounting_primary(primary_headnode)
+        if not ok:
+            print(f"  ⚠ Warning: Could not update primary in database: {error}")
         else:
-            print(f"  ✓ Updated slurmaccounting primary={primary_headnode} in cmdaemon database")
-        
-        # Verify the update was applied
-        verify_sql = "SELECT CAST(extra_values AS CHAR) FROM Roles WHERE CAST(name AS CHAR)='slurmaccounting'"
-        result = subprocess.run(
-            ["mysql", "-N", "cmdaemon", "-e", verify_sql],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0:
-            current_value = result.stdout.strip()
+            if rows:
+                print(f"  ✓ Updated slurmaccounting primary={primary_headnode} in cmdaemon database")
+            else:
+                print(f"  ✓ slurmaccounting primary was already {primary_headnode}")
             if primary_headnode in current_value:
                 print(f"  ✓ Verified: {current_value}")
             else:
@@ -998,13 +1465,14 @@ quit
         print(f"  Starting cmdaemon...")
         result = subprocess.run(
             ["systemctl", "start", "cmd"],
-            capture_output=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
             text=True,
             timeout=60
         )
         if result.returncode == 0:
             print(f"  ✓ cmdaemon started")
-            time.sleep(5)  # Give cmdaemon time to fully start
+            if not _wait_for_cmdaemon(running=True):
+                print(f"  ⚠ Warning: cmdaemon not answering cmsh after {_CMD_WAIT_TIMEOUT}s")
         else:
             print(f"  ⚠ Warning: Could not start cmdaemon: {result.stderr}")
         
@@ -1039,40 +1507,41 @@ def update_slurm_conf(primary_headnode: str, secondary_headnode: str, skip_confi
         print(f"  ✗ slurm.conf not found at {slurm_conf_path}")
         return False
     
-    print(f"\n{'=' * 65}")
+    print(f"\n{_SEP}")
     print("CHECKING SLURM.CONF ACCOUNTING SETTINGS")
-    print('=' * 65)
+    print(_SEP)
     
     try:
-        # Read current content
-        with open(slurm_conf_path, 'r') as f:
-            lines = f.readlines()
-        
-        # Find the autogenerated section markers and check its contents
-        autogen_start = None
-        autogen_end = None
+        # One streaming pass over the file: check the autogenerated section's
+        # values and note the accounting host entries outside of it
         autogen_has_host = False
         autogen_has_backup = False
         autogen_host_correct = False
         autogen_backup_correct = False
         autogen_host_value = None
         autogen_backup_value = None
+        duplicates_outside = []
+        section = 'before'
         
-        for i, line in enumerate(lines):
-            if 'BEGIN AUTOGENERATED SECTION' in line:
-                autogen_start = i
-            elif 'END AUTOGENERATED SECTION' in line:
-                autogen_end = i
-                break
-            elif autogen_start is not None:
-                # We're inside the autogenerated section
+        with open(slurm_conf_path, 'r') as f:
+            for i, line in enumerate(f):
+                if section != 'after' and 'BEGIN AUTOGENERATED SECTION' in line:
+                    section = 'inside'
+                    continue
+                if section == 'inside' and 'END AUTOGENERATED SECTION' in line:
+                    section = 'after'
+                    continue
                 line_stripped = line.strip()
-                if line_stripped.startswith('AccountingStorageHost='):
+                if not line_stripped.startswith(('AccountingStorageHost=', 'AccountingStorageBackupHost=')):
+                    continue
+                if section != 'inside':
+                    duplicates_outside.append((i, line_stripped))
+                elif line_stripped.startswith('AccountingStorageHost='):
                     autogen_has_host = True
                     autogen_host_value = line_stripped.split('=', 1)[1]
                     if f'AccountingStorageHost={primary_headnode}' == line_stripped:
                         autogen_host_correct = True
-                elif line_stripped.startswith('AccountingStorageBackupHost='):
+                else:
                     autogen_has_backup = True
                     autogen_backup_value = line_stripped.split('=', 1)[1]
                     if secondary_headnode and f'AccountingStorageBackupHost={secondary_headnode}' == line_stripped:
@@ -1103,15 +1572,6 @@ def update_slurm_conf(primary_headnode: str, secondary_headnode: str, skip_confi
             print(f"  BCM should regenerate slurm.conf with correct values.")
             print(f"  If values are still wrong after cmdaemon restart, check Step 7 in the manual procedure.")
         
-        # Count duplicates outside autogenerated section
-        duplicates_outside = []
-        for i, line in enumerate(lines):
-            if autogen_start is not None and autogen_start <= i <= (autogen_end or len(lines)):
-                continue  # Skip autogenerated section
-            line_stripped = line.strip()
-            if line_stripped.startswith('AccountingStorageHost=') or line_stripped.startswith('AccountingStorageBackupHost='):
-                duplicates_outside.append((i, line_stripped))
-        
         if duplicates_outside:
             print(f"\n  Found {len(duplicates_outside)} duplicate entries outside autogenerated section:")
             for line_num, content in duplicates_outside:
@@ -1122,20 +1582,26 @@ def update_slurm_conf(primary_headnode: str, secondary_headnode: str, skip_confi
                     print("Skipping duplicate removal.")
                     return bcm_handles_it
             
-            # Remove duplicates
-            new_lines = []
-            for i, line in enumerate(lines):
-                if autogen_start is not None and autogen_start <= i <= (autogen_end or len(lines)):
-                    new_lines.append(line)
-                    continue
-                line_stripped = line.strip()
-                if line_stripped.startswith('AccountingStorageHost=') or line_stripped.startswith('AccountingStorageBackupHost='):
-                    print(f"  Removing: {line_stripped}")
-                    continue
-                new_lines.append(line)
-            
-            with open(slurm_conf_path, 'w') as f:
-                f.writelines(new_lines)
+            # Remove duplicates, replacing the file atomically so that a
+            # failed write cannot leave slurm.conf truncated. The file is read
+            # again here; a line is only dropped if it is still the one that
+            # was reported.
+            remove = dict(duplicates_outside)
+            for content in remove.values():
+                print(f"  Removing: {content}")
+            fd, tmp_path = tempfile.mkstemp(dir=slurm_conf_path.parent, prefix=".slurm.conf-")
+            try:
+                with os.fdopen(fd, 'w') as f, open(slurm_conf_path, 'r') as src:
+                    f.writelines(
+                        line for i, line in enumerate(src) if remove.get(i) != line.strip()
+                    )
+                st = slurm_conf_path.stat()
+                os.chmod(tmp_path, st.st_mode & 0o7777)
+                os.chown(tmp_path, st.st_uid, st.st_gid)
+                os.replace(tmp_path, slurm_conf_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
             print(f"  ✓ Removed duplicate entries from {slurm_conf_path}")
         else:
             print(f"\n  ✓ No duplicate entries found outside autogenerated section")
@@ -1149,40 +1615,88 @@ def update_slurm_conf(primary_headnode: str, secondary_headnode: str, skip_confi
 
 def format_time(seconds: float) -> str:
     """Format seconds into MM:SS format."""
-    minutes = int(seconds) // 60
-    secs = int(seconds) % 60
+    minutes, secs = divmod(int(seconds), 60)
     return f"{minutes:02d}:{secs:02d}"
 
 
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
 def format_bytes(size: int) -> str:
     """Format bytes to human readable format."""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size < 1024:
-            return f"{size:.1f} {unit}"
-        size /= 1024
-    return f"{size:.1f} TB"
+    # Each unit is 2**10 times the previous one
+    unit_idx = min((max(int(size), 1).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{size / (1 << (unit_idx * 10)):.1f} {_BYTE_UNITS[unit_idx]}"
 
 
-def discover_slurmdbd_nodes() -> list:
-    """Discover nodes that run slurmdbd via BCM slurmaccounting role.
+@contextmanager
+def _progress(label: str, status, interval: float = 2):
+    """Show a spinner line for as long as the with-block runs.
     
-    Uses 'device; foreach -l slurmaccounting' to find devices that have
-    the slurmaccounting role assigned (directly or via overlay).
+    The line is redrawn every interval seconds by one background thread,
+    which wakes up at once when the block ends instead of finishing a sleep.
     
-    Returns:
-        List of node hostnames that run slurmdbd
+    Args:
+        label: What is in progress, e.g. "Importing"
+        status: Called on each redraw; returns the text shown after the
+            elapsed time ("" for none)
+        interval: Seconds between redraws
     """
-    nodes = []
-    cmsh_path = "/cm/local/apps/cmd/bin/cmsh"
-    
-    if not os.path.exists(cmsh_path):
-        print("  cmsh not found, cannot discover slurmdbd nodes")
+    done = threading.Event()
+    start_time = time.time()
+
+    def reporter():
+        spinner_chars = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
+        spin_idx = 0
+        while True:
+            elapsed = time.time() - start_time
+            detail = status()
+            sys.stdout.write(f"\r  {spinner_chars[spin_idx]} {label}... {format_time(elapsed)} elapsed"
+                             f"{' | ' + detail if detail else ''}   ")
+            sys.stdout.flush()
+            spin_idx = (spin_idx + 1) % len(spinner_chars)
+            if done.wait(interval):
+                break
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
+    reporter_thread = threading.Thread(target=reporter, daemon=True)
+    reporter_thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        # status() may be waiting on the import probe (up to 10 s)
+        reporter_thread.join(timeout=15)
+
+
+def discover_slurmdbd_nodes() -> list:
+    """Discover nodes that run slurmdbd via BCM slurmaccounting role.
+    
+    Uses 'device; foreach -l slurmaccounting' to find devices that have
+    the slurmaccounting role assigned (directly or via overlay).
+    
+    Returns:
+        List of node hostnames that run slurmdbd
+    """
+    nodes = []
+    if not cmsh_available():
+        print("  cmsh not found, cannot discover slurmdbd nodes")
+        return nodes
+    
+    layout = _query_slurmaccounting_layout()
+    if layout:
+        nodes = list(layout[0])
+        if nodes:
+            print(f"  Found slurmdbd nodes: {', '.join(nodes)}")
+        else:
+            print(f"  ⚠ No devices found with slurmaccounting role")
         return nodes
     
     try:
         # Use foreach -l to find devices with slurmaccounting role (via overlay)
         result = subprocess.run(
-            [cmsh_path, '-c', 'device; foreach -l slurmaccounting (get hostname)'],
+            [_CMSH_PATH, '-c', 'device; foreach -l slurmaccounting (get hostname)'],
             capture_output=True,
             text=True,
             timeout=30
@@ -1192,10 +1706,7 @@ def discover_slurmdbd_nodes() -> list:
             print(f"  Could not query devices with slurmaccounting role: {result.stderr}")
             return nodes
         
-        for line in result.stdout.strip().split('\n'):
-            line = line.strip()
-            if line:
-                nodes.append(line)
+        nodes = [line.strip() for line in result.stdout.splitlines() if line.strip()]
         
         if nodes:
             print(f"  Found slurmdbd nodes: {', '.join(nodes)}")
@@ -1208,6 +1719,36 @@ def discover_slurmdbd_nodes() -> list:
     return nodes
 
 
+def _slurmdbd_is_active(node: str) -> bool:
+    """Check whether slurmdbd is active on node (via SSH)."""
+    result = run_ssh(node, "systemctl is-active slurmdbd", timeout=10, capture=False)
+    # is-active exits 0 only for an active unit
+    return result.returncode == 0
+
+
+def check_slurmdbd_active(nodes: list) -> dict:
+    """Check slurmdbd on all nodes concurrently.
+    
+    Each check is an SSH round trip bounded only by its timeout, so the
+    checks run in parallel and the caller waits once for all of them.
+    
+    Returns:
+        {node: True/False, or the exception if the check itself failed},
+        in the order of nodes
+    """
+    if len(nodes) == 1:
+        node = nodes[0]
+        try:
+            return {node: _slurmdbd_is_active(node)}
+        except Exception as e:
+            return {node: e}
+    
+    with ThreadPoolExecutor(max_workers=min(32, len(nodes))) as executor:
+        futures = {node: executor.submit(_slurmdbd_is_active, node) for node in nodes}
+        wait(futures.values(), return_when=ALL_COMPLETED)
+    return {node: future.exception() or future.result() for node, future in futures.items()}
+
+
 def stop_slurmdbd_via_cmsh() -> bool:
     """Stop slurmdbd on all nodes with slurmaccounting role via cmsh.
     
@@ -1216,13 +1757,10 @@ def stop_slurmdbd_via_cmsh() -> bool:
     Returns:
         True if stop command succeeded, False otherwise
     """
-    cmsh_path = "/cm/local/apps/cmd/bin/cmsh"
-    
     try:
         result = subprocess.run(
-            [cmsh_path, '-c', 'device; foreach -l slurmaccounting (services; stop slurmdbd)'],
-            capture_output=True,
-            text=True,
+            [_CMSH_PATH, '-c', _CMSH_STOP_SLURMDBD],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
             timeout=60
         )
         return result.returncode == 0
@@ -1239,13 +1777,11 @@ def prepare_for_migration(cfg) -> bool:
     Returns:
         True if ready to proceed, False if preparation failed
     """
-    print(f"\n{'=' * 65}")
+    print(f"\n{_SEP}")
     print("PREPARING FOR MIGRATION")
-    print('=' * 65)
+    print(_SEP)
     
     storage_host = cfg['storage_host']
-    storage_user = cfg['storage_user']
-    storage_pass = cfg['storage_pass']
     storage_loc = cfg['storage_loc']
     
     # Discover nodes that run slurmdbd
@@ -1260,22 +1796,14 @@ def prepare_for_migration(cfg) -> bool:
     nodes_with_slurmdbd = []
     if slurmdbd_nodes:
         print("\nChecking slurmdbd status...")
-        for node in slurmdbd_nodes:
-            try:
-                result = subprocess.run(
-                    ['ssh', '-o', 'ConnectTimeout=5', '-o', 'StrictHostKeyChecking=no',
-                     node, 'systemctl is-active slurmdbd'],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                if result.returncode == 0 and 'active' in result.stdout:
-                    nodes_with_slurmdbd.append(node)
-                    print(f"    {node}: slurmdbd is running")
-                else:
-                    print(f"    {node}: slurmdbd is stopped")
-            except Exception as e:
-                print(f"    {node}: could not check ({e})")
+        for node, status in check_slurmdbd_active(slurmdbd_nodes).items():
+            if isinstance(status, Exception):
+                print(f"    {node}: could not check ({status})")
+            elif status:
+                nodes_with_slurmdbd.append(node)
+                print(f"    {node}: slurmdbd is running")
+            else:
+                print(f"    {node}: slurmdbd is stopped")
     
     # Stop slurmdbd if running - use cmsh to prevent BCM auto-restart
     if nodes_with_slurmdbd:
@@ -1299,20 +1827,18 @@ def prepare_for_migration(cfg) -> bool:
     try:
         # Query processlist for connections to our database
         check_cmd = [
-            'mysql',
-            '-h', storage_host,
-            '-u', storage_user,
-            f"-p{storage_pass}",
+            *_remote_mysql_args(cfg),
             '-N', '-e',
             f"SELECT Id, User, Host, db, Command, Time FROM information_schema.processlist "
-            f"WHERE db = '{storage_loc}' AND Command != 'Query' AND Id != CONNECTION_ID();"
+            f"WHERE db = {_sql_str(storage_loc)} AND Command != 'Query' AND Id != CONNECTION_ID();"
         ]
         result = subprocess.run(check_cmd, capture_output=True, text=True, timeout=10)
         
         if result.returncode == 0 and result.stdout.strip():
-            for line in result.stdout.strip().split('\n'):
-                parts = line.split('\t')
-                if len(parts) >= 4:
+            for line in result.stdout.splitlines():
+                parts = line.split('\t', 5)
+                # The id goes into KILL unquoted, so only take numeric ones
+                if len(parts) >= 4 and parts[0].isdigit():
                     conn_id = parts[0]
                     conn_user = parts[1]
                     conn_host = parts[2]
@@ -1334,23 +1860,25 @@ def prepare_for_migration(cfg) -> bool:
         
         answer = input(f"  Kill these connections to proceed? [Y/n]: ").strip().lower()
         if answer not in ('n', 'no'):
-            for conn in blocking_connections:
-                try:
-                    kill_cmd = [
-                        'mysql',
-                        '-h', storage_host,
-                        '-u', storage_user,
-                        f"-p{storage_pass}",
-                        '-e', f"KILL {conn['id']};"
-                    ]
-                    result = subprocess.run(kill_cmd, capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        print(f"    ✓ Killed connection {conn['id']}")
-                    else:
+            # One client session for all of them; --force keeps going past
+            # connections that closed in the meantime
+            kill_sql = " ".join(f"KILL {conn['id']};" for conn in blocking_connections)
+            try:
+                result = subprocess.run(
+                    [*_remote_mysql_args(cfg), '--force', '-e', kill_sql],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=10
+                )
+                failed = set(_KILL_FAILED_ID_RE.findall(result.stderr))
+                for conn in blocking_connections:
+                    if conn['id'] in failed:
                         # Connection may have already closed
                         print(f"    ⚠ Connection {conn['id']} already closed or could not kill")
-                except Exception as e:
-                    print(f"    ⚠ Error killing connection {conn['id']}: {e}")
+                    elif result.returncode == 0 or failed:
+                        print(f"    ✓ Killed connection {conn['id']}")
+                if result.returncode != 0 and not failed:
+                    print(f"    ⚠ Error killing connections: {result.stderr.strip()}")
+            except Exception as e:
+                print(f"    ⚠ Error killing connections: {e}")
             # Give a moment for connections to fully close
             time.sleep(1)
         else:
@@ -1362,87 +1890,358 @@ def prepare_for_migration(cfg) -> bool:
     return True
 
 
-def dump_remote_slurm_db(cfg, dump_path: Path):
+def _advise_sequential(fd: int) -> None:
+    """Hint that a file will be read once, front to back (larger readahead)."""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+
+def _drop_page_cache(fd: int, sync: bool = False) -> None:
+    """Ask the kernel to drop cached pages of a file we will not re-read.
+    
+    Keeps a multi-GB dump from evicting cmdaemon/MySQL pages on the head node.
+    POSIX_FADV_DONTNEED only drops clean pages, so sync=True writes dirty
+    pages back first. Best-effort: silently ignored where unsupported.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        if sync:
+            os.fdatasync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Reserve size bytes for a file being streamed to, so it gets few large extents.
+    
+    The file must be truncated to the bytes actually written afterwards.
+    Best-effort: a failure (e.g. not enough space for the estimate, or a
+    filesystem without fallocate) just leaves the file to grow normally.
+    """
+    if size <= 0 or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError:
+        pass
+
+
+def select_dump_codec() -> dict | None:
+    """Pick the first available compressor for the staged dump (None = plain SQL)."""
+    for name, codec in _DUMP_CODECS.items():
+        if shutil.which(codec["compress"][0]):
+            return dict(codec, name=name)
+    return None
+
+
+_CREATE_TABLE_RE = re.compile(r"^CREATE TABLE (`(?:[^`]|``)+`) \($")
+_COLUMN_NAME_RE = re.compile(r"^\s*(`(?:[^`]|``)+`)")
+_KEY_FIRST_COLUMN_RE = re.compile(r"\((`(?:[^`]|``)+`)")
+
+
+def split_secondary_indexes(schema: str) -> tuple:
+    """Move plain secondary KEYs out of the CREATE TABLEs of a --no-data dump.
+    
+    Loading rows into a table without its secondary indexes and building the
+    indexes afterwards is much faster than maintaining them row by row.
+    PRIMARY and UNIQUE keys stay in place (they define the row identity).
+    Tables with foreign keys are left untouched, as are keys on an
+    AUTO_INCREMENT column, which the table cannot be created without.
+    
+    Args:
+        schema: Output of 'mysqldump --no-data'
+        
+    Returns:
+        Tuple of (schema without the deferred keys, list of
+        'ALTER TABLE ... ADD KEY ...' statements that restore them)
+    """
+    out = []
+    alters = []
+    lines = iter(schema.split("\n"))
+    for line in lines:
+        out.append(line)
+        m = _CREATE_TABLE_RE.match(line)
+        if not m:
+            continue
+        
+        body = []
+        for line in lines:
+            if line.startswith(")"):
+                break
+            body.append(line)
+        else:
+            # Unterminated definition; keep it exactly as dumped
+            out.extend(body)
+            break
+        
+        defs = [d.rstrip(",") for d in body]
+        deferred = []
+        if not any(d.lstrip().startswith(("CONSTRAINT", "FOREIGN KEY")) for d in defs):
+            auto_inc = set()
+            for d in defs:
+                col = _COLUMN_NAME_RE.match(d)
+                if col and " AUTO_INCREMENT" in d:
+                    auto_inc.add(col.group(1))
+            for d in defs:
+                first_col = _KEY_FIRST_COLUMN_RE.search(d)
+                if d.startswith("  KEY ") and first_col and first_col.group(1) not in auto_inc:
+                    deferred.append(d)
+        
+        if deferred:
+            defs = [d for d in defs if d not in deferred]
+            alters.append(
+                f"ALTER TABLE {m.group(1)} "
+                + ", ".join(f"ADD {d.strip()}" for d in deferred) + ";"
+            )
+        out.append(",\n".join(defs))
+        out.append(line)
+    
+    return "\n".join(out), alters
+
+
+def _write_dump_part(out_f, data: bytes, codec: dict | None) -> None:
+    """Append data to the dump file, as its own compressed frame if codec is set.
+    
+    zstd frames and gzip members can be concatenated; the decompressor
+    yields the concatenation of their contents.
+    """
+    if not codec:
+        out_f.write(data)
+        return
+    out_f.flush()
+    result = subprocess.run(codec["compress"], input=data, stdout=out_f, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise RuntimeError(f"{codec['name']} failed: {result.stderr.decode(errors='replace')}")
+
+
+# --compress-transport: mysqldump runs on the StorageHost instead (socket
+# auth as root over SSH) and its output crosses the network compressed with
+# one of these, rather than with the client protocol's zlib. zstd -3 on all
+# cores keeps well ahead of a gigabit link.
+_TRANSPORT_CODECS = {
+    "zstd": (["zstd", "-T0", "-3", "-q", "-c"], ["zstd", "-d", "-q", "-c"]),
+    "gzip": (["gzip", "-1", "-c"], ["gzip", "-d", "-c"]),
+}
+
+
+def _remote_dump_transport_cmd(cfg, dump_opts: list, transport: str) -> list | None:
+    """Build a data dump command that runs mysqldump on the StorageHost.
+    
+    Args:
+        cfg: Parsed slurmdbd.conf settings
+        dump_opts: mysqldump options and database, without connection options
+        transport: Key of _TRANSPORT_CODECS
+        
+    Returns:
+        Local command whose stdout is the uncompressed dump, or None if the
+        StorageHost lacks mysqldump, the compressor or a socket (the caller
+        then dumps over the client protocol)
+    """
+    storage_host = cfg["storage_host"]
+    compress, decompress = _TRANSPORT_CODECS[transport]
+    if not shutil.which(decompress[0]):
+        print(f"  ⚠ {decompress[0]} not found; using mysqldump --compress instead")
+        return None
+    result = run_ssh(storage_host, f"command -v mysqldump && command -v {compress[0]}", capture=False)
+    if result.returncode != 0:
+        print(f"  ⚠ mysqldump or {compress[0]} not found on {storage_host}; using mysqldump --compress instead")
+        return None
+    socket_path = find_remote_mysql_socket(storage_host)
+    if not socket_path:
+        print(f"  ⚠ Could not find MySQL socket on {storage_host}; using mysqldump --compress instead")
+        return None
+    
+    remote_cmd = (
+        f"set -o pipefail; mysqldump --socket={shlex.quote(socket_path)} {shlex.join(dump_opts)} "
+        f"| {shlex.join(compress)}"
+    )
+    ssh_cmd = ["ssh"] + _SSH_OPTIONS + _ssh_control_args(storage_host) + [
+        storage_host, f"bash -c {shlex.quote(remote_cmd)}",
+    ]
+    print(f"  Dumping on {storage_host}, {transport}-compressed over SSH")
+    return ["bash", "-o", "pipefail", "-c", f"{shlex.join(ssh_cmd)} | {shlex.join(decompress)}"]
+
+
+def _prepare_remote_dump(cfg, transport: str | None = None) -> tuple:
+    """Dump the table definitions and build the mysqldump command for the data.
+    
+    See dump_remote_slurm_db() for the layout of the dump and the options.
+    
+    Args:
+        cfg: Parsed slurmdbd.conf settings
+        transport: Run the data dump on the StorageHost and compress it on
+            the wire with this _TRANSPORT_CODECS key (None: client protocol)
+    
+    Returns:
+        Tuple of (schema SQL without the deferred secondary KEYs,
+        SQL adding those KEYs back, mysqldump command for the data)
+    """
+    storage_host = cfg["storage_host"]
+    storage_loc = cfg["storage_loc"]
+
+    # Build mysqldump commands with MySQL/MariaDB compatibility options
+    common_opts = [
+        f"--max-allowed-packet={_MAX_ALLOWED_PACKET}",
+        "--default-character-set=utf8mb4",
+    ]
+    base_cmd = [*_remote_mysql_args(cfg, "mysqldump"), "--compress", *common_opts]
+    schema_cmd = base_cmd + [
+        "--no-data",
+        "--no-tablespaces",
+        "--skip-triggers",
+        "--routines",
+        "--events",
+        storage_loc,  # Database name without --databases flag
+    ]
+    data_opts = [
+        "--no-create-info",
+        "--extended-insert",
+        # COMMIT after each table, so the import's transaction (and its
+        # undo log) only ever spans one table rather than the whole dump
+        "--no-autocommit",
+        "--single-transaction",
+        "--quick",
+        "--skip-lock-tables",
+        "--order-by-primary",
+        f"--net-buffer-length={_NET_BUFFER_LENGTH}",
+        "--triggers",
+        storage_loc,
+    ]
+    cmd = base_cmd + data_opts
+    if transport:
+        cmd = _remote_dump_transport_cmd(cfg, common_opts + data_opts, transport) or cmd
+
+    result = subprocess.run(schema_cmd, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"mysqldump --no-data failed (host={storage_host}, db={storage_loc}):\n"
+            f"{result.stderr.decode(errors='replace')}"
+        )
+    schema, add_indexes = split_secondary_indexes(result.stdout.decode("utf-8", "surrogateescape"))
+    if add_indexes:
+        print(f"  Deferring secondary indexes on {len(add_indexes)} tables until after the data load")
+    add_indexes_sql = "\n-- Secondary indexes, built after the data load\n" + "\n".join(add_indexes) + "\n"
+    return (
+        schema.encode("utf-8", "surrogateescape"),
+        add_indexes_sql.encode("utf-8", "surrogateescape"),
+        cmd,
+    )
+
+
+
+def dump_remote_slurm_db(cfg, dump_path: Path, codec: dict | None = None,
+                         transport: str | None = None):
     """Dump the remote Slurm accounting DB using mysqldump from this head node.
     
+    The dump file is written in three parts so that the import can load rows
+    before building secondary indexes:
+    1. Table definitions without their plain secondary KEYs, plus routines
+       and events (mysqldump --no-data)
+    2. Table data and triggers (mysqldump --no-create-info)
+    3. ALTER TABLE statements adding the secondary KEYs back
+    
     Uses options for maximum MySQL/MariaDB compatibility:
     - --default-character-set=utf8mb4: Ensures consistent character encoding
     - --single-transaction: Consistent snapshot without locking
+    - --quick / --skip-lock-tables: Stream rows instead of buffering whole tables
+    - --order-by-primary: Rows arrive in primary key order for sequential inserts
+    - --net-buffer-length / --max-allowed-packet: Fewer, larger INSERT packets
+    - --no-autocommit: One transaction per table on import
+    - --compress: zlib protocol compression on the link to StorageHost
     - --routines: Include stored procedures
     - --triggers: Include triggers (usually default, but explicit is safer)
     - --events: Include scheduled events
     - No --databases flag: Avoids including CREATE DATABASE in dump (we create it explicitly)
+    
+    If a codec from select_dump_codec() is given, each part is compressed
+    with it on the way to dump_path. With a transport, the data part is
+    dumped on the StorageHost and compressed on the wire instead (see
+    _remote_dump_transport_cmd()).
     """
     storage_host = cfg["storage_host"]
-    storage_user = cfg["storage_user"]
-    storage_pass = cfg["storage_pass"]
     storage_loc = cfg["storage_loc"]
 
     print(f"\nDumping Slurm accounting DB from {storage_host} ...")
     dump_dir = dump_path.parent
     dump_dir.mkdir(parents=True, exist_ok=True)
 
-    # Build mysqldump command with MySQL/MariaDB compatibility options
-    cmd = [
-        "mysqldump",
-        "-h", storage_host,
-        "-u", storage_user,
-        f"-p{storage_pass}",
-        "--single-transaction",
-        "--routines",
-        "--triggers",
-        "--events",
-        "--default-character-set=utf8mb4",
-        storage_loc,  # Database name without --databases flag
-    ]
+    schema, add_indexes, cmd = _prepare_remote_dump(cfg, transport)
 
     # Run mysqldump with progress indicator
-    dump_complete = [False]
     dump_error = [None]
+    dump_fd = [None]
     start_time = time.time()
     
-    def progress_reporter():
-        spinner_chars = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
-        spin_idx = 0
-        
-        while not dump_complete[0]:
-            elapsed = time.time() - start_time
-            
-            # Check current file size
-            try:
-                if dump_path.exists():
-                    current_size = dump_path.stat().st_size
-                    size_str = format_bytes(current_size)
-                else:
-                    size_str = "0 B"
-            except:
-                size_str = "..."
-            
-            status = f"\r  {spinner_chars[spin_idx]} Exporting... {format_time(elapsed)} elapsed | {size_str} written"
-            sys.stdout.write(status)
-            sys.stdout.flush()
-            
-            spin_idx = (spin_idx + 1) % len(spinner_chars)
-            time.sleep(0.5)
-        
-        sys.stdout.write("\n")
-        sys.stdout.flush()
-    
-    # Start progress thread
-    progress_thread = threading.Thread(target=progress_reporter, daemon=True)
-    progress_thread.start()
+    def status() -> str:
+        # Bytes written so far (the write offset; the file size includes the
+        # preallocated space)
+        fd = dump_fd[0]
+        if fd is None:
+            return "0 B written"
+        try:
+            written = os.lseek(fd, 0, os.SEEK_CUR)
+        except OSError:
+            return "... written"
+        # Drop the pages writeback has already flushed
+        _drop_page_cache(fd)
+        return f"{format_bytes(written)} written"
     
     try:
-        with open(dump_path, "w") as out_f:
-            result = subprocess.run(cmd, stdout=out_f, stderr=subprocess.PIPE, text=True)
-        
-        if result.returncode != 0:
-            dump_error[0] = result.stderr
+        with _progress("Exporting", status), open(dump_path, "wb", buffering=_IO_CHUNK) as out_f:
+            dump_fd[0] = out_f.fileno()
+            # Table data sizes approximate the SQL text; compressed dumps are
+            # roughly a quarter of that
+            estimate = (_CACHED_REMOTE_DB_INFO or {}).get("data_bytes", 0)
+            _preallocate(out_f.fileno(), estimate // 4 if codec else estimate)
+            _write_dump_part(out_f, schema, codec)
+            out_f.flush()
+            if codec:
+                dump_proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                             pipesize=_IO_CHUNK)
+                compress_proc = subprocess.Popen(
+                    codec["compress"],
+                    stdin=dump_proc.stdout,
+                    stdout=out_f,
+                    stderr=subprocess.PIPE,
+                )
+                # Close our copy so the compressor sees EOF when mysqldump exits
+                dump_proc.stdout.close()
+                dump_stderr = dump_proc.stderr.read()
+                dump_proc.wait()
+                compress_stderr = compress_proc.communicate()[1]
+                if dump_proc.returncode != 0:
+                    dump_error[0] = (dump_stderr.decode(errors="replace")
+                                     or f"exit status {dump_proc.returncode}")
+                elif compress_proc.returncode != 0:
+                    dump_error[0] = f"{codec['name']} failed: {compress_stderr.decode(errors='replace')}"
+            else:
+                # Copy through a pipe rather than handing mysqldump the file:
+                # its stdio writes the file in st_blksize (4 KiB) pieces,
+                # splice moves up to _IO_CHUNK at a time. stderr goes to a
+                # temporary file so that it cannot fill up while we copy.
+                with tempfile.TemporaryFile() as dump_err:
+                    dump_proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=dump_err,
+                                                 bufsize=_IO_CHUNK, pipesize=_IO_CHUNK)
+                    with dump_proc.stdout:
+                        _copy_pipe_to_file(dump_proc.stdout, out_f)
+                    if dump_proc.wait() != 0:
+                        dump_err.seek(0)
+                        dump_error[0] = (dump_err.read().decode(errors="replace")
+                                         or f"exit status {dump_proc.returncode}")
+            if not dump_error[0]:
+                _write_dump_part(out_f, add_indexes, codec)
+            out_f.flush()
+            # Drop whatever part of the preallocation was not used
+            os.ftruncate(out_f.fileno(), os.lseek(out_f.fileno(), 0, os.SEEK_CUR))
+            dump_fd[0] = None
+            _drop_page_cache(out_f.fileno(), sync=True)
     except Exception as e:
         dump_error[0] = str(e)
-    finally:
-        dump_complete[0] = True
-        progress_thread.join(timeout=2)
     
     if dump_error[0]:
         raise RuntimeError(
@@ -1451,14 +2250,178 @@ def dump_remote_slurm_db(cfg, dump_path: Path):
 
     final_size = dump_path.stat().st_size
     elapsed = time.time() - start_time
-    print(f"  ✓ Dump completed: {format_bytes(final_size)} in {format_time(elapsed)}")
+    compressed = f" ({codec['name']}-compressed)" if codec else ""
+    print(f"  ✓ Dump completed: {format_bytes(final_size)}{compressed} in {format_time(elapsed)}")
     print(f"    Saved to: {dump_path}")
 
 
+def _balance_tables(sizes: dict, groups: int) -> list:
+    """Split tables into at most groups lists of roughly equal total size.
+    
+    Largest table first, each into the currently smallest group.
+    
+    Args:
+        sizes: {table name: bytes}
+        groups: Number of groups wanted
+        
+    Returns:
+        Non-empty lists of table names
+    """
+    buckets = [(0, i, []) for i in range(groups)]
+    for table in sorted(sizes, key=sizes.get, reverse=True):
+        total, i, tables = heapq.heappop(buckets)
+        tables.append(table)
+        heapq.heappush(buckets, (total + sizes[table], i, tables))
+    return [tables for _, _, tables in sorted(buckets, key=lambda b: b[1]) if tables]
+
+
+def dump_remote_slurm_db_tab(cfg, tab_dir: Path) -> bool:
+    """Export the Slurm accounting DB as per-table TSV files (mysqldump --tab).
+    
+    mysqldump --tab makes the *server* write the .txt data files, so it runs on
+    the StorageHost over SSH (socket auth as root) into a directory permitted
+    by secure_file_priv. The directory is then copied back with rsync.
+    Up to _TAB_DUMP_JOBS mysqldump processes export the tables in parallel.
+    
+    Returns:
+        True if the export is in tab_dir, False if --tab is not possible on
+        this server (caller should fall back to the SQL dump)
+    """
+    storage_host = cfg["storage_host"]
+    storage_loc = cfg["storage_loc"]
+
+    print(f"\nExporting Slurm accounting DB from {storage_host} as TSV (mysqldump --tab) ...")
+
+    # secure_file_priv: NULL disables server-side file export entirely, a
+    # directory restricts it to that directory, empty allows any directory.
+    result = subprocess.run(
+        _remote_mysql_args(cfg) + ["-N", "-e", "SELECT IFNULL(@@secure_file_priv, 'NULL');"],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(f"  ⚠ Could not query secure_file_priv: {result.stderr.strip()}")
+        return False
+    secure_file_priv = result.stdout.strip()
+    if secure_file_priv == "NULL":
+        print("  ⚠ secure_file_priv is NULL on the server; --tab export is not permitted")
+        return False
+    export_parent = secure_file_priv.rstrip("/") or "/var/tmp"
+
+    socket_path = find_remote_mysql_socket(storage_host)
+    if not socket_path:
+        print(f"  ⚠ Could not find MySQL socket on {storage_host}")
+        return False
+
+    # Each process takes its own snapshot; that is consistent because
+    # slurmdbd was stopped and its connections killed beforehand. Without
+    # table sizes, one process exports the whole database. Views (size 0)
+    # are listed too, or the explicit table lists would leave them out.
+    result = subprocess.run(
+        _remote_mysql_args(cfg) + [
+            "-N", "-B", "-e",
+            "SELECT table_name, IFNULL(data_length + index_length, 0) "
+            "FROM information_schema.tables WHERE table_schema = DATABASE() "
+            "AND table_type IN ('BASE TABLE', 'VIEW');",
+        ],
+        capture_output=True, text=True
+    )
+    sizes = {}
+    for line in result.stdout.splitlines() if result.returncode == 0 else []:
+        name, _, size = line.partition("\t")
+        if size.isdigit():
+            sizes[name] = int(size)
+    groups = _balance_tables(sizes, _TAB_DUMP_JOBS) or [[]]
+    
+    # Routines and events are not part of the per-table files; mysqldump
+    # writes them to stdout, which we keep next to the table files. Only the
+    # first process includes them.
+    jobs = []
+    routines_out = f'"$dir"/{_TAB_ROUTINES_FILE}'
+    for i, tables in enumerate(groups):
+        jobs.append(
+            f"mysqldump --socket={shlex.quote(socket_path)} --tab=\"$dir\" "
+            f"--single-transaction --quick --skip-lock-tables --triggers "
+            f"{'--routines --events ' if i == 0 else ''}--default-character-set=utf8mb4 "
+            f"{shlex.join([storage_loc] + tables)} "
+            f"> {routines_out if i == 0 else '/dev/null'} & pids=\"$pids $!\"; "
+        )
+    # The export directory gets an unpredictable name (mktemp -d, mode 0700)
+    # and is handed to the mysqld user, who writes the .txt files; owner and
+    # group are taken from the server's socket. Nobody else can pre-create,
+    # read or change it. Its path is the script's only output.
+    remote_cmd = (
+        f"dir=$(mktemp -d {shlex.quote(f'{export_parent}/{tab_dir.name}.XXXXXX')}) || exit 1; "
+        f"chown \"$(stat -c %U:%G {shlex.quote(socket_path)})\" \"$dir\" "
+        f"|| {{ rm -rf \"$dir\"; exit 1; }}; "
+        f"echo \"$dir\"; pids=; "
+        + "".join(jobs)
+        + "rc=0; for p in $pids; do wait $p || rc=1; done; "
+        "[ $rc = 0 ] || rm -rf \"$dir\"; exit $rc"
+    )
+    if len(groups) > 1:
+        print(f"  {len(sizes)} tables in {len(groups)} parallel mysqldump processes")
+    start_time = time.time()
+    result = run_ssh(storage_host, remote_cmd, timeout=None)
+    if result.returncode != 0:
+        print(f"  ⚠ mysqldump --tab failed on {storage_host}: {result.stderr.decode(errors='replace').strip()}")
+        return False
+    remote_dir = result.stdout.decode(errors="replace").strip()
+
+    tab_dir.mkdir(parents=True, exist_ok=True)
+    # -z: the TSV files compress several times over; rsync >= 3.2 negotiates
+    # zstd for it, older versions use zlib
+    result = subprocess.run(
+        ["rsync", "-a", "-z", "-e", shlex.join(["ssh"] + _SSH_OPTIONS + _ssh_control_args(storage_host)),
+         f"{storage_host}:{remote_dir}/", f"{tab_dir}/"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    run_ssh(storage_host, f"rm -rf {shlex.quote(remote_dir)}", capture=False)
+    if result.returncode != 0:
+        raise RuntimeError(f"rsync of {storage_host}:{remote_dir} failed:\n{result.stderr}")
+
+    export_size = sum(p.stat().st_size for p in tab_dir.iterdir())
+    elapsed = time.time() - start_time
+    print(f"  ✓ Export completed: {format_bytes(export_size)} in {format_time(elapsed)}")
+    print(f"    Saved to: {tab_dir}")
+    return True
+
+
+def load_checkpoint(checkpoint_path: Path) -> dict | None:
+    """Load the migration checkpoint (None if there is none or it is unreadable)."""
+    try:
+        with open(checkpoint_path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"  ⚠ Ignoring unreadable checkpoint {checkpoint_path}: {e}")
+        return None
+
+
+def save_checkpoint(checkpoint_path: Path, state: dict) -> None:
+    """Atomically replace the migration checkpoint with state.
+    
+    The state is written to a temporary file in the same directory and
+    renamed over the checkpoint, so an interrupted run never leaves a
+    truncated checkpoint behind.
+    """
+    checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=checkpoint_path.parent, prefix=".checkpoint-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, checkpoint_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
 def get_local_table_count(storage_loc: str, mysql_base: list) -> int:
     """Query the local database for the current number of tables."""
     try:
-        query = f"SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = '{storage_loc}';"
+        query = f"SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = {_sql_str(storage_loc)};"
         result = subprocess.run(
             mysql_base + ['-N', '-e', query],
             capture_output=True, text=True, timeout=10
@@ -1470,16 +2433,395 @@ def get_local_table_count(storage_loc: str, mysql_base: list) -> int:
     return -1
 
 
-def import_db_to_local(cfg, dump_path: Path):
-    """Import the dumped DB into local MariaDB/MySQL on the BCM head node.
+def _start_import_probe(storage_loc: str, mysql_base: list) -> tuple:
+    """Start one local mysql client for the import progress queries.
     
-    Creates the database with utf8mb4 charset, imports the dump, and
-    creates the Slurm user with mysql_native_password authentication
-    for maximum compatibility between MySQL and MariaDB.
+    The progress reporters sample the import every few seconds; sending each
+    query to the same client session saves a fork, connect and login per
+    sample.
+    
+    Returns:
+        (probe, close): probe() returns (tables, bytes loaded), or (-1, 0)
+        if the query did not answer; close() ends the client
+    """
+    query = (
+        f"SELECT COUNT(*), IFNULL(SUM(data_length + index_length), 0) "
+        f"FROM information_schema.tables WHERE table_schema = {_sql_str(storage_loc)};\n"
+    ).encode()
+    proc = None
+    unavailable = False
+
+    def stop() -> None:
+        nonlocal proc
+        if proc is not None:
+            proc.kill()
+            proc.wait()
+            proc = None
+
+    def probe() -> tuple:
+        nonlocal proc, unavailable
+        if proc is None and not unavailable:
+            try:
+                # Unbuffered binary pipes: the answer is read straight off the
+                # fd, so select() sees everything that has arrived
+                proc = subprocess.Popen(
+                    mysql_base + ["-N", "-B", "--unbuffered", "--force"],
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                    bufsize=0,
+                )
+            except OSError:
+                unavailable = True
+        if proc is None:
+            return -1, 0
+        
+        answer = b""
+        deadline = time.monotonic() + 10
+        try:
+            proc.stdin.write(query)
+            while not answer.endswith(b"\n"):
+                # Don't hang the progress line on a stuck or failed query
+                remaining = deadline - time.monotonic()
+                ready = remaining > 0 and select.select([proc.stdout], [], [], remaining)[0]
+                data = os.read(proc.stdout.fileno(), 4096) if ready else b""
+                if not data:
+                    # The answer may still come, and would then be taken for
+                    # the next sample's; start over with a new client instead
+                    stop()
+                    return -1, 0
+                answer += data
+        except (OSError, ValueError):
+            stop()
+            return -1, 0
+        fields = answer.split()
+        if len(fields) == 2 and all(f.isdigit() for f in fields):
+            return int(fields[0]), int(fields[1])
+        return -1, 0
+
+    def close() -> None:
+        nonlocal proc
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+            proc = None
+        except (OSError, subprocess.TimeoutExpired):
+            stop()
+
+    return probe, close
+
+
+def _can_disable_binlog(mysql_base: list) -> bool:
+    """Check whether the import user may turn off binary logging for its session.
+
+    SET sql_log_bin requires SUPER (or BINLOG ADMIN); if the cmdaemon user lacks
+    it, the prelude must not include it or mysql would abort the import.
+    The passive head node is re-synced with 'cmha dbreclone' afterwards, so
+    skipping the binlog for the import does not lose replicated data.
+    """
+    result = subprocess.run(
+        mysql_base + ["-e", "SET SESSION sql_log_bin=0;"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return result.returncode == 0
+
+
+def _raise_local_max_allowed_packet(mysql_base: list, socket_path: str | None) -> None:
+    """Make the local server accept packets as large as the client may send.
+    
+    The import client sends up to --max-allowed-packet (1G): an extended
+    INSERT is up to net_buffer_length, but a single large row (e.g. a job
+    script) is sent as one statement of its own size. MariaDB's default of
+    16M would drop the connection ("server has gone away") on those. SET
+    GLOBAL applies to connections opened afterwards, i.e. to the import.
+    """
+    result = subprocess.run(
+        mysql_base + ["-N", "-e", "SELECT @@global.max_allowed_packet;"],
+        capture_output=True, text=True
+    )
+    current = result.stdout.strip()
+    if result.returncode != 0 or not current.isdigit() or int(current) >= _MAX_ALLOWED_PACKET_BYTES:
+        return
+    
+    result = subprocess.run(
+        _local_mysql_admin_base_args(socket_path)
+        + ["-e", f"SET GLOBAL max_allowed_packet={_MAX_ALLOWED_PACKET_BYTES};"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    if result.returncode == 0:
+        print(f"  ✓ Raised max_allowed_packet from {format_bytes(int(current))} to "
+              f"{format_bytes(_MAX_ALLOWED_PACKET_BYTES)} for the import")
+    else:
+        print(f"  ⚠ Could not raise max_allowed_packet ({format_bytes(int(current))}): "
+              f"{result.stderr.strip()}")
+        print(f"    Rows larger than that will make the import fail.")
+
+
+def _set_mysql_globals(mysql_admin: list, settings: dict, read_previous: bool = True) -> dict:
+    """SET GLOBAL the given variables on the local server in one statement.
+    
+    Args:
+        mysql_admin: Local admin mysql args
+        settings: {variable: value}
+        read_previous: Read the current values first (False when restoring)
+    
+    Returns:
+        The previous values of the variables (settings itself if
+        read_previous is False), or {} if they were not changed
+    """
+    if not settings:
+        return {}
+    names = list(settings)
+    previous = [str(v) for v in settings.values()]
+    if read_previous:
+        result = subprocess.run(
+            mysql_admin + ["-N", "-B", "-e", "SELECT " + ", ".join(f"@@global.{n}" for n in names) + ";"],
+            capture_output=True, text=True
+        )
+        previous = result.stdout.rstrip("\n").split("\t")
+        if result.returncode != 0 or len(previous) != len(names):
+            print(f"  ⚠ Could not read {', '.join(names)}: {result.stderr.strip()}")
+            return {}
+    
+    assignments = ", ".join(f"GLOBAL {n}={v}" for n, v in settings.items())
+    result = subprocess.run(
+        mysql_admin + ["-e", f"SET {assignments};"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    if result.returncode != 0:
+        print(f"  ⚠ Could not set {assignments}: {result.stderr.strip()}")
+        return {}
+    return dict(zip(names, previous))
+
+
+def _meminfo() -> dict:
+    """MemTotal and MemAvailable from /proc/meminfo in bytes (0 if unknown)."""
+    info = {"MemTotal": 0, "MemAvailable": 0}
+    try:
+        # /proc files report a 1 KiB block size, which Python would take as
+        # its buffer size; one 64 KiB buffer reads the file in one go
+        with open("/proc/meminfo", buffering=65536) as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in info:
+                    info[key] = int(value.split()[0]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return info
+
+
+# Cap on the buffer pool during the import. The head node keeps running
+# cmdaemon, slurmctld and the dump/import pipeline next to MariaDB, so the
+# pool may take at most a quarter of the RAM and half of what is free.
+_BUFFER_POOL_MAX_TOTAL_FRACTION = 4
+_BUFFER_POOL_MAX_AVAILABLE_FRACTION = 2
+
+
+def _import_buffer_pool_size(mysql_admin: list) -> int:
+    """Buffer pool size to use for the import, or 0 to leave it as it is.
+    
+    Up to a quarter of the RAM, and no more than half of the memory
+    currently available, if that is more than the server has now; the
+    default of 128 MiB makes inserts fall back to random disk I/O as soon
+    as the hot parts of the tables outgrow it.
+    """
+    result = subprocess.run(
+        mysql_admin + ["-N", "-e", "SELECT @@global.innodb_buffer_pool_size;"],
+        capture_output=True, text=True
+    )
+    current = result.stdout.strip()
+    if result.returncode != 0 or not current.isdigit():
+        return 0
+    memory = _meminfo()
+    target = min(memory["MemTotal"] // _BUFFER_POOL_MAX_TOTAL_FRACTION,
+                 memory["MemAvailable"] // _BUFFER_POOL_MAX_AVAILABLE_FRACTION)
+    return target if target > int(current) else 0
+
+
+# The x.y.z at the start of VERSION(), e.g. "10.6.16-MariaDB" or "8.0.36"
+_SERVER_VERSION_RE = re.compile(r"(\d+)\.(\d+)\.(\d+)")
+
+
+@lru_cache(maxsize=1)
+def _local_server_version() -> tuple:
+    """VERSION() of the local server, queried once per run.
+    
+    Returns:
+        Tuple of (version string, (major, minor, patch)); ("", ()) if the
+        server could not be asked
+    """
+    mysql_base = _local_mysql_base_args(detect_mysql_socket() or None)
+    result = subprocess.run(mysql_base + ["-N", "-e", "SELECT VERSION();"], capture_output=True, text=True)
+    version = result.stdout.strip() if result.returncode == 0 else ""
+    numbers = _SERVER_VERSION_RE.match(version)
+    return version, tuple(map(int, numbers.groups())) if numbers else ()
+
+
+def detect_server_flavor() -> str:
+    """Tell which SQL dialect the local server speaks.
+    
+    Returns:
+        'mariadb', 'mysql8' (MySQL 5.7.6+ account syntax, IDENTIFIED WITH
+        ... BY), 'mysql_legacy' (older MySQL), or '' if unknown
+    """
+    version, numbers = _local_server_version()
+    if not numbers:
+        return ""
+    if "mariadb" in version.lower():
+        return "mariadb"
+    return "mysql8" if numbers >= (5, 7, 6) else "mysql_legacy"
+
+
+@contextmanager
+def _bulk_load_mode(disable_redo_log: bool = False):
+    """Relax the local server's durability settings while the import runs.
+    
+    - innodb_flush_log_at_trx_commit=2: the redo log is written at commit
+      but only flushed to disk once a second
+    - innodb_buffer_pool_size: raised to at most 25% of the RAM and half
+      of the available memory
+    - Only with disable_redo_log, MySQL 8.0.21+: ALTER INSTANCE DISABLE
+      INNODB REDO_LOG
+    
+    All are undone when the block exits, also on failure. Settings the
+    admin account may not change are skipped with a warning.
+    
+    These are server-wide settings. On a BCM head node the same server
+    holds the cmdaemon database and is replicated by cmha, so they affect
+    every transaction of that server during the import, not just the
+    import. With innodb_flush_log_at_trx_commit=2, an OS crash or power
+    loss can lose the last second of commits of any database on it. With
+    the redo log disabled, a server crash can leave the whole instance
+    unable to start, cmdaemon database included, and the kept dump only
+    restores the Slurm accounting data. MySQL advises against disabling
+    the redo log on production systems, hence the explicit opt-in.
+    
+    Args:
+        disable_redo_log: Also disable the InnoDB redo log (--disable-redo-log)
+    """
+    mysql_admin = _local_mysql_admin_base_args(detect_mysql_socket() or None)
+    print("\nRelaxing local InnoDB durability for the import ...")
+    saved = _set_mysql_globals(mysql_admin, {"innodb_flush_log_at_trx_commit": 2})
+    
+    redo_disabled = False
+    if (disable_redo_log and detect_server_flavor() == "mysql8"
+            and _local_server_version()[1] >= (8, 0, 21)):
+        result = subprocess.run(
+            mysql_admin + ["-e", "ALTER INSTANCE DISABLE INNODB REDO_LOG;"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        redo_disabled = result.returncode == 0
+        if not redo_disabled:
+            print(f"  ⚠ Could not disable the InnoDB redo log: {result.stderr.strip()}")
+    if saved:
+        print(f"  ✓ innodb_flush_log_at_trx_commit=2 (was {saved['innodb_flush_log_at_trx_commit']})")
+    
+    # Set on its own, so a refused resize leaves the other setting in place
+    pool_size = _import_buffer_pool_size(mysql_admin)
+    if pool_size:
+        saved_pool = _set_mysql_globals(mysql_admin, {"innodb_buffer_pool_size": pool_size})
+        if saved_pool:
+            print(f"  ✓ innodb_buffer_pool_size={format_bytes(pool_size)} "
+                  f"(was {format_bytes(int(saved_pool['innodb_buffer_pool_size']))})")
+        saved.update(saved_pool)
+    if redo_disabled:
+        print(f"  ✓ InnoDB redo log disabled")
+    
+    try:
+        yield
+    finally:
+        if redo_disabled:
+            result = subprocess.run(
+                mysql_admin + ["-e", "ALTER INSTANCE ENABLE INNODB REDO_LOG;"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+            )
+            if result.returncode != 0:
+                print(f"  ⚠ Could not re-enable the InnoDB redo log: {result.stderr.strip()}")
+                print(f"    Run: mysql -e 'ALTER INSTANCE ENABLE INNODB REDO_LOG;'")
+        if saved and _set_mysql_globals(mysql_admin, saved, read_previous=False):
+            print(f"  ✓ Restored {', '.join(f'{n}={v}' for n, v in saved.items())}")
+
+
+def _copy_file_to_pipe(src, dst) -> None:
+    """Copy an open file into a pipe, in the kernel where possible.
+    
+    os.sendfile moves the file pages into the pipe without bouncing them
+    through a Python buffer; where it is not supported the copy falls back
+    to shutil.copyfileobj with 1 MiB chunks.
+    """
+    if hasattr(os, "sendfile"):
+        dst.flush()
+        in_fd, out_fd = src.fileno(), dst.fileno()
+        offset = src.tell()
+        try:
+            while True:
+                sent = os.sendfile(out_fd, in_fd, offset, _IO_CHUNK)
+                if sent == 0:
+                    return
+                offset += sent
+        except BrokenPipeError:
+            raise
+        except OSError:
+            # sendfile not supported for this pair; continue from where it stopped
+            src.seek(offset)
+    shutil.copyfileobj(src, dst, _IO_CHUNK)
+
+
+def _copy_pipe_to_file(src, dst) -> None:
+    """Copy a pipe into an open file until EOF, in the kernel where possible.
+    
+    The counterpart of _copy_file_to_pipe: os.splice (Linux, Python 3.10+)
+    moves the pipe pages into the file without a userspace copy; where it
+    is not supported the copy falls back to shutil.copyfileobj.
+    """
+    dst.flush()
+    if hasattr(os, "splice"):
+        in_fd, out_fd = src.fileno(), dst.fileno()
+        try:
+            while os.splice(in_fd, out_fd, _IO_CHUNK):
+                pass
+            return
+        except OSError:
+            # splice not supported for this file; nothing read was lost,
+            # so continue from where it stopped
+            pass
+    shutil.copyfileobj(src, dst, _IO_CHUNK)
+
+
+def _feed_import_stdin(proc: subprocess.Popen, prelude: bytes, sources: list, postlude: bytes) -> None:
+    """Write prelude, each source, then postlude to the stdin of the import process.
+    
+    Sources are file paths or readable binary streams (e.g. a decompressor's stdout).
+    """
+    try:
+        proc.stdin.write(prelude)
+        for source in sources:
+            if isinstance(source, Path):
+                with open(source, "rb", buffering=_IO_CHUNK) as src:
+                    _advise_sequential(src.fileno())
+                    _copy_file_to_pipe(src, proc.stdin)
+                    _drop_page_cache(src.fileno())
+            else:
+                shutil.copyfileobj(source, proc.stdin, _IO_CHUNK)
+        proc.stdin.write(postlude)
+    except BrokenPipeError:
+        # mysql exited early; its stderr is reported by the caller
+        pass
+    finally:
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+
+
+def _prepare_local_import(cfg) -> tuple:
+    """Create the database locally and build the mysql command to import into it.
+    
+    Returns:
+        Tuple of (socket path or None, local mysql base args,
+        import command, session prelude to send ahead of the dump)
     """
     storage_loc = cfg["storage_loc"]
-    storage_user = cfg["storage_user"]
-    storage_pass = cfg["storage_pass"]
 
     socket_path = detect_mysql_socket()
     # Use cmdaemon DB creds (from cmd.conf) for create/import. On BCM systems this
@@ -1492,6 +2834,33 @@ def import_db_to_local(cfg, dump_path: Path):
         f"DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;"
     )
     run_cmd(mysql_base + ["-e", create_db_sql])
+    _raise_local_max_allowed_packet(mysql_base, socket_path if socket_path else None)
+
+    prelude = _IMPORT_PRELUDE
+    if _can_disable_binlog(mysql_base):
+        prelude += _IMPORT_NO_BINLOG
+
+    # Use --default-character-set for import as well
+    import_cmd = mysql_base + [
+        "--default-character-set=utf8mb4",
+        f"--max-allowed-packet={_MAX_ALLOWED_PACKET}",
+        f"--init-command={_IMPORT_INIT_COMMAND}",
+        storage_loc,
+    ]
+    return socket_path, mysql_base, import_cmd, prelude
+
+
+def import_db_to_local(cfg, dump_path: Path, codec: dict | None = None):
+    """Import the dumped DB into local MariaDB/MySQL on the BCM head node.
+    
+    Creates the database with utf8mb4 charset, imports the dump, and
+    creates the Slurm user with mysql_native_password authentication
+    for maximum compatibility between MySQL and MariaDB. A dump written
+    with a codec is decompressed on the fly.
+    """
+    storage_loc = cfg["storage_loc"]
+
+    socket_path, mysql_base, import_cmd, prelude = _prepare_local_import(cfg)
 
     # Get dump file size for display
     dump_size = dump_path.stat().st_size
@@ -1499,56 +2868,67 @@ def import_db_to_local(cfg, dump_path: Path):
     print(f"  Source file: {format_bytes(dump_size)}")
     
     # Run import with progress indicator
-    import_complete = [False]
     import_error = [None]
     start_time = time.time()
+    probe, close_probe = _start_import_probe(storage_loc, mysql_base)
     
-    def progress_reporter():
-        spinner_chars = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
-        spin_idx = 0
-        
-        while not import_complete[0]:
-            elapsed = time.time() - start_time
-            
-            # Query table count for progress
-            current_table_count = get_local_table_count(storage_loc, mysql_base)
-            if current_table_count >= 0:
-                table_str = f"| {current_table_count} tables"
-            else:
-                table_str = ""
-            
-            status = f"\r  {spinner_chars[spin_idx]} Importing... {format_time(elapsed)} elapsed {table_str}   "
-            sys.stdout.write(status)
-            sys.stdout.flush()
-            
-            spin_idx = (spin_idx + 1) % len(spinner_chars)
-            time.sleep(1)
-        
-        sys.stdout.write("\n")
-        sys.stdout.flush()
-    
-    # Start progress thread
-    progress_thread = threading.Thread(target=progress_reporter, daemon=True)
-    progress_thread.start()
+    def status() -> str:
+        tables, loaded = probe()
+        return f"{tables} tables, {format_bytes(loaded)} loaded" if tables >= 0 else ""
     
+    # stderr of the decompressor goes to a temporary file: it is only read
+    # at the end, and a full stderr pipe would stall the decompressor
+    decompress_err = tempfile.TemporaryFile()
     try:
-        # Use --default-character-set for import as well
-        import_cmd = mysql_base + ["--default-character-set=utf8mb4", storage_loc]
-        with open(dump_path, "r") as in_f:
-            result = subprocess.run(
+        with _progress("Importing", status):
+            decompress_proc = None
+            source = dump_path
+            if codec:
+                # Feed the decompressor from our own fd so the read-side cache
+                # hints apply to the compressed file as well. Unbuffered: the
+                # child reads the fd directly, a Python buffer would go unused
+                compressed_f = open(dump_path, "rb", buffering=0)
+                _advise_sequential(compressed_f.fileno())
+                decompress_proc = subprocess.Popen(
+                    codec["decompress"],
+                    stdin=compressed_f,
+                    stdout=subprocess.PIPE,
+                    stderr=decompress_err,
+                    bufsize=_IO_CHUNK,
+                    pipesize=_IO_CHUNK,
+                )
+                source = decompress_proc.stdout
+            proc = subprocess.Popen(
                 import_cmd,
-                stdin=in_f,
-                stdout=subprocess.PIPE,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
-                text=True,
+                bufsize=_IO_CHUNK,
+                pipesize=_IO_CHUNK,
             )
-        if result.returncode != 0:
-            import_error[0] = result.stderr
+            feeder = threading.Thread(
+                target=_feed_import_stdin,
+                args=(proc, prelude, [source], _IMPORT_POSTLUDE),
+                daemon=True,
+            )
+            feeder.start()
+            stderr = proc.stderr.read()
+            proc.wait()
+            feeder.join()
+            if proc.returncode != 0:
+                import_error[0] = stderr.decode(errors="replace")
+            if decompress_proc:
+                _drop_page_cache(compressed_f.fileno())
+                compressed_f.close()
+                decompress_proc.stdout.close()
+                if decompress_proc.wait() != 0 and not import_error[0]:
+                    decompress_err.seek(0)
+                    import_error[0] = f"{codec['name']} failed: {decompress_err.read().decode(errors='replace')}"
     except Exception as e:
         import_error[0] = str(e)
     finally:
-        import_complete[0] = True
-        progress_thread.join(timeout=2)
+        decompress_err.close()
+        close_probe()
     
     if import_error[0]:
         raise RuntimeError(
@@ -1559,64 +2939,380 @@ def import_db_to_local(cfg, dump_path: Path):
     final_table_count = get_local_table_count(storage_loc, mysql_base)
     print(f"  ✓ Import completed: {final_table_count} tables in {format_time(elapsed)}")
 
+    grant_local_db_user(cfg, socket_path)
+
+
+def stream_remote_slurm_db_to_local(cfg, dump_path: Path, codec: dict | None = None,
+                                    checkpoint_path: Path | None = None,
+                                    transport: str | None = None):
+    """Dump the remote DB straight into the local one, keeping a copy in dump_path.
+    
+    mysqldump's output is read once and written both to the local mysql
+    client and to dump_path (through the codec's compressor, if any), so the
+    import runs while the dump is still in progress and the dump file is
+    never read back. The dump has the same layout as dump_remote_slurm_db().
+    
+    If the import fails, the copy to dump_path still runs to the end so the
+    dump can be re-imported with --resume.
+    
+    Args:
+        cfg: Parsed slurmdbd.conf settings
+        dump_path: Where to keep the dump
+        codec: Compressor for the kept dump, from select_dump_codec()
+        checkpoint_path: If given, the completed dump is recorded there
+        transport: Compression on the wire, see _prepare_remote_dump()
+    """
+    storage_host = cfg["storage_host"]
+    storage_loc = cfg["storage_loc"]
+
+    print(f"\nStreaming Slurm accounting DB from {storage_host} into the local database ...")
+    dump_path.parent.mkdir(parents=True, exist_ok=True)
+
+    schema, add_indexes, dump_cmd = _prepare_remote_dump(cfg, transport)
+    socket_path, mysql_base, import_cmd, prelude = _prepare_local_import(cfg)
+
+    streamed = [0]
+    dump_fd = [None]
+    start_time = time.time()
+    probe, close_probe = _start_import_probe(storage_loc, mysql_base)
+
+    def status() -> str:
+        # Drop the pages writeback has already flushed, and see how far the
+        # import has got
+        if dump_fd[0] is not None:
+            _drop_page_cache(dump_fd[0])
+        tables, loaded = probe()
+        loaded_str = f" | {tables} tables, {format_bytes(loaded)} loaded" if tables >= 0 else ""
+        return f"{format_bytes(streamed[0])} transferred{loaded_str}"
+
+    # stderr goes to temporary files so that no process can block on a full
+    # stderr pipe while we are busy feeding the others
+    dump_err = tempfile.TemporaryFile()
+    import_err = tempfile.TemporaryFile()
+    compress_err = tempfile.TemporaryFile()
+    dump_error = None
+    import_error = None
+    procs = []
+    try:
+        with _progress("Streaming", status), open(dump_path, "wb", buffering=_IO_CHUNK) as out_f:
+            dump_fd[0] = out_f.fileno()
+            estimate = (_CACHED_REMOTE_DB_INFO or {}).get("data_bytes", 0)
+            _preallocate(out_f.fileno(), estimate // 4 if codec else estimate)
+
+            compress_proc = None
+            dump_sink = out_f
+            if codec:
+                compress_proc = subprocess.Popen(
+                    codec["compress"], stdin=subprocess.PIPE, stdout=out_f,
+                    stderr=compress_err, bufsize=_IO_CHUNK, pipesize=_IO_CHUNK,
+                )
+                dump_sink = compress_proc.stdin
+            import_proc = subprocess.Popen(
+                import_cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                stderr=import_err, bufsize=_IO_CHUNK, pipesize=_IO_CHUNK,
+            )
+            dump_proc = subprocess.Popen(
+                dump_cmd, stdout=subprocess.PIPE, stderr=dump_err, bufsize=_IO_CHUNK,
+                pipesize=_IO_CHUNK,
+            )
+            procs = [p for p in (compress_proc, import_proc, dump_proc) if p]
+
+            importing = True
+
+            def tee(chunk: bytes, to_dump: bool = True):
+                nonlocal importing
+                if to_dump:
+                    dump_sink.write(chunk)
+                if importing:
+                    try:
+                        import_proc.stdin.write(chunk)
+                    except BrokenPipeError:
+                        # mysql exited; keep writing the dump file for --resume
+                        importing = False
+
+            tee(prelude, to_dump=False)
+            tee(schema)
+            while chunk := dump_proc.stdout.read(_IO_CHUNK):
+                tee(chunk)
+                streamed[0] += len(chunk)
+            if dump_proc.wait() == 0:
+                tee(add_indexes)
+                tee(_IMPORT_POSTLUDE, to_dump=False)
+            elif importing:
+                # Truncated dump: don't COMMIT it. Killing the client drops its
+                # connection, which rolls back the table being loaded and stops
+                # whatever is still queued. The dump commits after each table
+                # (--no-autocommit), so the tables before it stay; the DROP
+                # TABLE statements of the next full run replace them.
+                import_proc.kill()
+                importing = False
+
+            try:
+                import_proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            if compress_proc:
+                compress_proc.stdin.close()
+                if compress_proc.wait() != 0:
+                    compress_err.seek(0)
+                    dump_error = f"{codec['name']} failed: {compress_err.read().decode(errors='replace')}"
+            if dump_proc.returncode != 0:
+                dump_err.seek(0)
+                dump_error = (dump_err.read().decode(errors="replace")
+                              or f"exit status {dump_proc.returncode}")
+            if import_proc.wait() != 0 and dump_proc.returncode == 0:
+                import_err.seek(0)
+                import_error = import_err.read().decode(errors="replace")
+
+            out_f.flush()
+            # Drop whatever part of the preallocation was not used
+            os.ftruncate(out_f.fileno(), os.lseek(out_f.fileno(), 0, os.SEEK_CUR))
+            dump_fd[0] = None
+            _drop_page_cache(out_f.fileno(), sync=True)
+    finally:
+        # Only still running if we bailed out early
+        for proc in procs:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+        close_probe()
+        for f in (dump_err, import_err, compress_err):
+            f.close()
+
+    if dump_error:
+        raise RuntimeError(
+            f"mysqldump failed (host={storage_host}, db={storage_loc}):\n{dump_error}"
+        )
+    if checkpoint_path:
+        save_checkpoint(checkpoint_path, {"dump_path": str(dump_path),
+                                          "codec": codec["name"] if codec else None})
+    if import_error:
+        raise RuntimeError(
+            f"mysql import failed into local DB {storage_loc}:\n{import_error}"
+        )
+
+    elapsed = time.time() - start_time
+    final_size = dump_path.stat().st_size
+    compressed = f", {codec['name']}-compressed" if codec else ""
+    final_table_count = get_local_table_count(storage_loc, mysql_base)
+    print(f"  ✓ Dump and import completed: {final_table_count} tables in {format_time(elapsed)}")
+    print(f"    Dump saved to: {dump_path} ({format_bytes(final_size)}{compressed})")
+
+    grant_local_db_user(cfg, socket_path)
+
+
+def mydumper_available() -> bool:
+    """Whether the parallel mydumper/myloader pair can be used for the migration."""
+    return bool(shutil.which("mydumper") and shutil.which("myloader"))
+
+
+def _myloader_cmd(mysql_base: list, storage_loc: str, directory: Path, threads: int) -> list:
+    """Build the myloader command for loading directory into the local DB.
+    
+    mysql_base supplies the local credentials (option file) and socket.
+    """
+    return ["myloader"] + mysql_base[1:] + [
+        f"--directory={directory}",
+        f"--database={storage_loc}",
+        f"--threads={threads}",
+        "--overwrite-tables",
+        # DEFINER users of the source server need not exist on the head node
+        "--skip-definer",
+        "--verbose=1",
+    ]
+
+
+def _mydumper_status(directory: Path):
+    """Progress text for a directory that mydumper files are arriving in.
+    
+    Each table's definition arrives as <db>.<table>-schema.sql, so those
+    files count the tables received.
+    """
+    def status() -> str:
+        size = tables = 0
+        try:
+            for entry in os.scandir(directory):
+                size += entry.stat().st_size
+                tables += entry.name.endswith("-schema.sql")
+        except OSError:
+            pass
+        return f"{tables} tables, {format_bytes(size)} received"
+    return status
+
+
+def stream_remote_slurm_db_mydumper(cfg, dump_dir: Path, threads: int,
+                                    checkpoint_path: Path | None = None):
+    """Copy the remote DB into the local one with mydumper piped into myloader.
+    
+    mydumper exports the tables over several connections (splitting large
+    tables into chunks) and streams the files to myloader, which loads them
+    with as many threads while the export is still running. myloader keeps
+    the received files in dump_dir. If the export completed, a failed load
+    can be repeated from them with --resume; if myloader stopped reading
+    before that, the files are incomplete, no checkpoint is written and the
+    migration has to be run again.
+    
+    Args:
+        cfg: Parsed slurmdbd.conf settings
+        dump_dir: Directory that keeps the mydumper files
+        threads: Threads for mydumper and for myloader
+        checkpoint_path: If given, the completed dump is recorded there
+    """
+    storage_host = cfg["storage_host"]
+    storage_loc = cfg["storage_loc"]
+
+    print(f"\nStreaming Slurm accounting DB from {storage_host} with mydumper/myloader "
+          f"({threads} threads) ...")
+    dump_dir.mkdir(parents=True, exist_ok=True)
+    socket_path, mysql_base, _, _ = _prepare_local_import(cfg)
+
+    dump_cmd = _remote_mysql_args(cfg, "mydumper") + [
+        f"--database={storage_loc}",
+        f"--threads={threads}",
+        f"--rows={_MYDUMPER_ROWS}",
+        f"--chunk-filesize={_MYDUMPER_CHUNK_MB}",
+        # Like mysqldump --compress: zlib on the link to StorageHost
+        "--compress-protocol",
+        "--routines",
+        "--triggers",
+        "--events",
+        # Working directory for the files before they are streamed
+        f"--outputdir={dump_dir}.tmp",
+        "--stream",
+    ]
+    load_cmd = _myloader_cmd(mysql_base, storage_loc, dump_dir, threads) + ["--stream=NO_DELETE"]
+
+    dump_err = tempfile.TemporaryFile()
+    load_err = tempfile.TemporaryFile()
+
+    def run():
+        dump_proc = subprocess.Popen(dump_cmd, stdout=subprocess.PIPE, stderr=dump_err,
+                                     bufsize=_IO_CHUNK, pipesize=_IO_CHUNK)
+        try:
+            load_proc = subprocess.Popen(load_cmd, stdin=dump_proc.stdout,
+                                         stdout=subprocess.DEVNULL, stderr=load_err)
+        except BaseException:
+            dump_proc.kill()
+            dump_proc.wait()
+            raise
+        # Only myloader holds the read end now, so mydumper sees EPIPE if it exits
+        dump_proc.stdout.close()
+        return dump_proc.wait(), load_proc.wait()
+
+    start_time = time.time()
+    try:
+        with _progress("Streaming", _mydumper_status(dump_dir)):
+            dump_rc, load_rc = run()
+        dump_err.seek(0)
+        load_err.seek(0)
+        dump_error = dump_err.read().decode(errors="replace")
+        load_error = load_err.read().decode(errors="replace")
+    finally:
+        dump_err.close()
+        load_err.close()
+        shutil.rmtree(f"{dump_dir}.tmp", ignore_errors=True)
+
+    if dump_rc != 0 and load_rc != 0:
+        # When myloader stops first, mydumper fails on the broken pipe; the
+        # myloader error is then the one that tells what went wrong
+        raise RuntimeError(
+            f"myloader failed into local DB {storage_loc}:\n{load_error}\n"
+            f"mydumper failed with it (host={storage_host}):\n{dump_error}"
+        )
+    if dump_rc != 0:
+        raise RuntimeError(
+            f"mydumper failed (host={storage_host}, db={storage_loc}):\n{dump_error}"
+        )
+    if checkpoint_path:
+        save_checkpoint(checkpoint_path, {"dump_path": str(dump_dir), "codec": None,
+                                          "format": "mydumper"})
+    if load_rc != 0:
+        raise RuntimeError(
+            f"myloader failed into local DB {storage_loc}:\n{load_error}"
+        )
+
+    elapsed = time.time() - start_time
+    final_table_count = get_local_table_count(storage_loc, mysql_base)
+    print(f"  ✓ Dump and import completed: {final_table_count} tables in {format_time(elapsed)}")
+    print(f"    Dump saved to: {dump_dir}")
+
+    grant_local_db_user(cfg, socket_path)
+
+
+def import_mydumper_dir_to_local(cfg, dump_dir: Path, threads: int):
+    """Load a directory kept by stream_remote_slurm_db_mydumper() with myloader.
+    
+    Tables are dropped and re-created, so a partial earlier load is replaced.
+    """
+    storage_loc = cfg["storage_loc"]
+
+    socket_path, mysql_base, _, _ = _prepare_local_import(cfg)
+    print(f"\nLoading {dump_dir} with myloader ({threads} threads) ...")
+    start_time = time.time()
+    probe, close_probe = _start_import_probe(storage_loc, mysql_base)
+
+    def status() -> str:
+        tables, loaded = probe()
+        return f"{tables} tables, {format_bytes(loaded)} loaded" if tables >= 0 else ""
+
+    try:
+        with _progress("Importing", status):
+            result = subprocess.run(_myloader_cmd(mysql_base, storage_loc, dump_dir, threads),
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    finally:
+        close_probe()
+    if result.returncode != 0:
+        raise RuntimeError(f"myloader failed into local DB {storage_loc}:\n{result.stderr}")
+
+    elapsed = time.time() - start_time
+    final_table_count = get_local_table_count(storage_loc, mysql_base)
+    print(f"  ✓ Import completed: {final_table_count} tables in {format_time(elapsed)}")
+
+    grant_local_db_user(cfg, socket_path)
+
+
+def grant_local_db_user(cfg, socket_path: str):
+    """Create/grant the Slurm DB user on the local DB and sync its password.
+    
+    The password is also updated on the secondary head node, which is required
+    for 'cmha dbreclone' to work afterwards.
+    """
+    storage_loc = cfg["storage_loc"]
+    storage_user = cfg["storage_user"]
+    storage_pass = cfg["storage_pass"]
+
     print("Granting privileges to Slurm DB user on local MariaDB/MySQL ...")
     mysql_admin_base = _local_mysql_admin_base_args(socket_path if socket_path else None)
     # Use mysql_native_password for compatibility between MySQL 8.x and MariaDB
-    # MariaDB syntax: IDENTIFIED VIA mysql_native_password USING PASSWORD('...')
-    # MySQL syntax: IDENTIFIED WITH mysql_native_password BY '...'
-    # We try MariaDB syntax first since BCM head nodes typically run MariaDB
-    grant_sql_mariadb = (
-        f"CREATE USER IF NOT EXISTS '{storage_user}'@'%' "
-        f"IDENTIFIED VIA mysql_native_password USING PASSWORD('{storage_pass}'); "
-        f"GRANT ALL PRIVILEGES ON `{storage_loc}`.* TO '{storage_user}'@'%'; "
-        f"FLUSH PRIVILEGES;"
-    )
-    
-    # Try MariaDB syntax first
-    result = subprocess.run(
-        mysql_admin_base + ["-e", grant_sql_mariadb],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-    
-    if result.returncode != 0:
-        # Fall back to MySQL 8.x / generic syntax
-        print("  MariaDB syntax failed, trying MySQL syntax...")
-        grant_sql_mysql = (
-            f"CREATE USER IF NOT EXISTS '{storage_user}'@'%' "
-            f"IDENTIFIED WITH mysql_native_password BY '{storage_pass}'; "
-            f"GRANT ALL PRIVILEGES ON `{storage_loc}`.* TO '{storage_user}'@'%'; "
-            f"FLUSH PRIVILEGES;"
+    user = _sql_str(storage_user)
+    password = _sql_str(storage_pass)
+    identified = {
+        "mariadb": f"IDENTIFIED VIA mysql_native_password USING PASSWORD({password})",
+        "mysql8": f"IDENTIFIED WITH mysql_native_password BY {password}",
+        "mysql_legacy": f"IDENTIFIED BY {password}",
+    }
+    # The server version picks the syntax; only if it could not be read are
+    # the variants tried in turn (MariaDB first, as on most BCM head nodes)
+    flavor = detect_server_flavor()
+    for syntax in [flavor] if flavor else list(identified):
+        result = _run_sql(
+            mysql_admin_base,
+            f"CREATE USER IF NOT EXISTS {user}@'%' {identified[syntax]}; "
+            f"GRANT ALL PRIVILEGES ON `{storage_loc}`.* TO {user}@'%'; FLUSH PRIVILEGES;",
         )
-        result2 = subprocess.run(
-            mysql_admin_base + ["-e", grant_sql_mysql],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        if result.returncode == 0:
+            break
+    else:
+        raise RuntimeError(
+            f"Could not create/grant '{storage_user}'@'%' on the local database:\n{result.stderr}"
         )
-        if result2.returncode != 0:
-            # Last resort: simple syntax (works on older versions)
-            print("  MySQL syntax failed, trying simple syntax...")
-            grant_sql_simple = (
-                f"CREATE USER IF NOT EXISTS '{storage_user}'@'%' "
-                f"IDENTIFIED BY '{storage_pass}'; "
-                f"GRANT ALL PRIVILEGES ON `{storage_loc}`.* TO '{storage_user}'@'%'; "
-                f"FLUSH PRIVILEGES;"
-            )
-            run_cmd(mysql_admin_base + ["-e", grant_sql_simple])
     
     # Ensure the password is set correctly even if user already existed
     # This is critical when migrating to BCM head nodes where the slurm user
     # may already exist with a different password
     print("  Ensuring Slurm DB user password matches slurmdbd.conf on local node...")
-    alter_sql = f"ALTER USER '{storage_user}'@'%' IDENTIFIED BY '{storage_pass}'; FLUSH PRIVILEGES;"
-    result = subprocess.run(
-        mysql_admin_base + ["-e", alter_sql],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
+    alter_sql = f"ALTER USER {user}@'%' IDENTIFIED BY {password}; FLUSH PRIVILEGES;"
+    result = _run_sql(mysql_admin_base, alter_sql)
     if result.returncode == 0:
         print(f"  ✓ Slurm DB user password updated on local node")
     else:
@@ -1629,46 +3325,345 @@ def import_db_to_local(cfg, dump_path: Path):
     if secondary_headnode:
         print(f"  Ensuring Slurm DB user password matches on secondary node ({secondary_headnode})...")
         # Use ssh to run the ALTER USER on the secondary node.
-        # Use BCM cmd.conf DB creds there as well (typically DBUser/DBPass = cmdaemon).
-        remote_mysql = "mysql"
-        # Prefer /etc/mysql/debian.cnf on the remote node if it exists, otherwise fall back
-        # to cmd.conf DBUser/DBPass.
+        # Prefer /etc/mysql/debian.cnf on the remote node if it works, otherwise fall back
+        # to BCM cmd.conf DB creds (typically DBUser/DBPass = cmdaemon).
         remote_creds = _parse_cmd_conf_db_creds()
-        remote_auth = ""
-        remote_auth_fallback = ""
-        if remote_creds.get("user"):
-            remote_auth_fallback += f" -u {remote_creds['user']}"
-        if remote_creds.get("pass"):
-            remote_auth_fallback += f" -p{remote_creds['pass']}"
-        remote_auth = f" --defaults-file=/etc/mysql/debian.cnf"
-        ssh_cmd = [
-            "ssh", secondary_headnode,
-            f"bash -lc \"{remote_mysql}{remote_auth} -e \\\"ALTER USER '{storage_user}'@'%' IDENTIFIED BY '{storage_pass}'; FLUSH PRIVILEGES;\\\" || {remote_mysql}{remote_auth_fallback} -e \\\"ALTER USER '{storage_user}'@'%' IDENTIFIED BY '{storage_pass}'; FLUSH PRIVILEGES;\\\"\""
-        ]
-        result = subprocess.run(
-            ssh_cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            timeout=30
+        # The fallback credentials come in on stdin ahead of the SQL, as a
+        # fixed number of option file lines, so they never appear on a
+        # command line; the SQL is read once so either client can be fed it
+        option_lines = _mysql_option_lines(
+            {"user": remote_creds.get("user"), "password": remote_creds.get("pass")}
+        )
+        option_lines += ["#"] * (3 - len(option_lines))
+        remote_script = (
+            'umask 077; cnf=$(mktemp) || exit 1; trap \'rm -f "$cnf"\' EXIT; '
+            'for i in 1 2 3; do IFS= read -r line; printf "%s\\n" "$line"; done > "$cnf"; '
+            'sql=$(cat); '
+            'printf "%s\\n" "$sql" | mysql --defaults-file=/etc/mysql/debian.cnf || '
+            'printf "%s\\n" "$sql" | mysql --defaults-extra-file="$cnf"'
+        )
+        stdin_text = "\n".join(option_lines) + "\n" + alter_sql
+        result = run_ssh(
+            secondary_headnode, f"bash -lc {shlex.quote(remote_script)}",
+            timeout=30, stdin_bytes=stdin_text.encode(),
         )
         if result.returncode == 0:
             print(f"  ✓ Slurm DB user password updated on secondary node ({secondary_headnode})")
         else:
-            print(f"  ⚠ Warning: Could not update password on {secondary_headnode}: {result.stderr}")
+            print(f"  ⚠ Warning: Could not update password on {secondary_headnode}: {result.stderr.decode(errors='replace')}")
             print(f"    You may need to manually run on {secondary_headnode}:")
             print(f"    mysql -e \"ALTER USER '{storage_user}'@'%' IDENTIFIED BY '<password>'; FLUSH PRIVILEGES;\"")
 
 
+def import_tab_dump_to_local(cfg, tab_dir: Path, checkpoint_path: Path | None = None):
+    """Import a mysqldump --tab export into the local MariaDB/MySQL.
+    
+    Table definitions are applied first, data is loaded with
+    'mysqlimport --local' (LOAD DATA LOCAL INFILE, several tables in
+    parallel), then routines/events. Requires local_infile on the server.
+    
+    Args:
+        cfg: Parsed slurmdbd.conf settings
+        tab_dir: Directory written by dump_remote_slurm_db_tab()
+        checkpoint_path: If given, loaded tables are recorded there and
+            tables already recorded by a previous run are skipped
+    """
+    storage_loc = cfg["storage_loc"]
+
+    socket_path = detect_mysql_socket()
+    mysql_base = _local_mysql_base_args(socket_path if socket_path else None)
+
+    state = (load_checkpoint(checkpoint_path) if checkpoint_path else None) or {}
+    state.setdefault("completed_tables", [])
+    state["failed_tables"] = {}
+    state_lock = threading.Lock()
+
+    def record(table: str, error: str | None = None):
+        with state_lock:
+            if error is None:
+                state["completed_tables"].append(table)
+            else:
+                state["failed_tables"][table] = error
+            if checkpoint_path:
+                save_checkpoint(checkpoint_path, state)
+
+    print("\nCreating database on local MariaDB/MySQL ...")
+    create_db_sql = (
+        f"CREATE DATABASE IF NOT EXISTS `{storage_loc}` "
+        f"DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;"
+    )
+    run_cmd(mysql_base + ["-e", create_db_sql])
+
+    schema_files = sorted(p for p in tab_dir.glob("*.sql") if p.name != _TAB_ROUTINES_FILE)
+    data_files = sorted(tab_dir.glob("*.txt"))
+    import_cmd = mysql_base + ["--default-character-set=utf8mb4", storage_loc]
+    start_time = time.time()
+
+    # The table definitions start with DROP TABLE, so they must not be
+    # re-applied on resume or they would discard the tables already loaded
+    if state.get("schema_loaded"):
+        print(f"\nTables already created by the interrupted run, keeping them")
+    else:
+        print(f"\nCreating {len(schema_files)} tables ...")
+        proc = subprocess.Popen(import_cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, bufsize=_IO_CHUNK, pipesize=_IO_CHUNK)
+        _feed_import_stdin(proc, _IMPORT_PRELUDE, schema_files, _IMPORT_POSTLUDE)
+        stderr = proc.stderr.read()
+        if proc.wait() != 0:
+            raise RuntimeError(f"Schema import failed into local DB {storage_loc}:\n{stderr.decode(errors='replace')}")
+        state["schema_loaded"] = True
+        if checkpoint_path:
+            save_checkpoint(checkpoint_path, state)
+
+    completed = set(state["completed_tables"])
+    pending = [p for p in data_files if p.stem not in completed]
+    if completed:
+        print(f"  Skipping {len(data_files) - len(pending)} tables loaded by the interrupted run")
+
+    def load_table(data_file: Path):
+        table = data_file.stem
+        # A table from a resumed run may hold a partial load; empty it so the
+        # reload is a plain insert into a clean table rather than duplicates
+        if state.get("resumed"):
+            result = subprocess.run(
+                mysql_base + ["-e", f"TRUNCATE TABLE `{storage_loc}`.`{table}`;"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+            )
+            if result.returncode != 0:
+                record(table, result.stderr.strip())
+                return
+        result = subprocess.run(
+            ["mysqlimport"] + mysql_base[1:] + [
+                "--local",
+                "--default-character-set=utf8mb4",
+                storage_loc,
+                str(data_file),
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        record(table, result.stderr.strip() if result.returncode != 0 else None)
+
+    threads = min(8, os.cpu_count() or 1)
+    print(f"Loading {len(pending)} data files with mysqlimport ({threads} threads) ...")
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(load_table, pending))
+
+    if state["failed_tables"]:
+        details = "\n".join(f"  {t}: {err}" for t, err in sorted(state["failed_tables"].items()))
+        raise RuntimeError(
+            f"mysqlimport failed for {len(state['failed_tables'])} table(s) in local DB "
+            f"{storage_loc}:\n{details}"
+        )
+
+    routines_file = tab_dir / _TAB_ROUTINES_FILE
+    if routines_file.exists():
+        with open(routines_file, "rb", buffering=_IO_CHUNK) as in_f:
+            result = subprocess.run(import_cmd, stdin=in_f, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"Routines import failed into local DB {storage_loc}:\n"
+                f"{result.stderr.decode(errors='replace')}"
+            )
+
+    elapsed = time.time() - start_time
+    final_table_count = get_local_table_count(storage_loc, mysql_base)
+    print(f"  ✓ Import completed: {final_table_count} tables in {format_time(elapsed)}")
+
+    grant_local_db_user(cfg, socket_path)
+
+
+def _mariadb_release(version: str) -> tuple:
+    """(major, minor) of a MariaDB VERSION() string, () if it is not MariaDB."""
+    numbers = _SERVER_VERSION_RE.match(version)
+    return tuple(map(int, numbers.groups()[:2])) if numbers and "mariadb" in version.lower() else ()
+
+
+def migrate_via_mariabackup(cfg, backup_dir: Path) -> bool:
+    """Copy the Slurm DB's InnoDB tablespaces from the StorageHost (--physical).
+    
+    mariabackup takes a partial backup of the database on the StorageHost,
+    streamed over SSH into mbstream here, and prepares it with --export.
+    The tables are then created locally from a --no-data dump and their
+    tablespaces swapped in (DISCARD TABLESPACE, copy .ibd/.cfg, IMPORT
+    TABLESPACE), so no rows are replayed and no indexes rebuilt. The local
+    server keeps running; nothing but the Slurm database is touched.
+    
+    Args:
+        cfg: Parsed slurmdbd.conf settings
+        backup_dir: New directory for the prepared backup (kept afterwards)
+        
+    Returns:
+        True if the database was imported, False if this path does not apply
+        (not the same MariaDB release on both sides, mariabackup/mbstream
+        missing, or non-InnoDB tables) or swapping the tablespaces in failed
+        (the local database is dropped again); the caller then uses a
+        logical dump
+    """
+    storage_host = cfg["storage_host"]
+    storage_loc = cfg["storage_loc"]
+    
+    print(f"\nCopying Slurm accounting DB from {storage_host} with mariabackup ...")
+    remote_release = _mariadb_release((_CACHED_REMOTE_DB_INFO or {}).get("version", ""))
+    local_release = _mariadb_release(_local_server_version()[0])
+    if not remote_release or remote_release != local_release:
+        print(f"  ⚠ Needs the same MariaDB release on both sides "
+              f"(StorageHost {'.'.join(map(str, remote_release)) or 'not MariaDB'}, "
+              f"local {'.'.join(map(str, local_release)) or 'not MariaDB'})")
+        return False
+    if not (shutil.which("mariabackup") and shutil.which("mbstream")):
+        print("  ⚠ mariabackup and mbstream are not both installed on this head node")
+        return False
+    if run_ssh(storage_host, "command -v mariabackup", capture=False).returncode != 0:
+        print(f"  ⚠ mariabackup is not installed on {storage_host}")
+        return False
+    socket_path = find_remote_mysql_socket(storage_host)
+    if not socket_path:
+        print(f"  ⚠ Could not find MySQL socket on {storage_host}")
+        return False
+    
+    result = subprocess.run(
+        _remote_mysql_args(cfg) + [
+            "-N", "-B", "-e",
+            "SELECT table_name, engine FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_type = 'BASE TABLE';",
+        ],
+        capture_output=True, text=True
+    )
+    engines = dict(line.split("\t", 1) for line in result.stdout.splitlines() if "\t" in line)
+    if result.returncode != 0 or not engines:
+        print(f"  ⚠ Could not list the tables of {storage_loc}: {result.stderr.strip()}")
+        return False
+    other = sorted(t for t, engine in engines.items() if engine.lower() != "innodb")
+    if other:
+        print(f"  ⚠ Not all tables are InnoDB ({', '.join(other)})")
+        return False
+    
+    # Backup: mariabackup on the StorageHost (socket auth as root) -> ssh -> mbstream
+    backup_dir.mkdir(parents=True)
+    start_time = time.time()
+    
+    def status() -> str:
+        received = sum(f.stat().st_size for f in backup_dir.rglob("*") if f.is_file())
+        return f"{format_bytes(received)} received"
+    
+    remote_cmd = (
+        f"mariabackup --backup --stream=xbstream --socket={shlex.quote(socket_path)} "
+        f"--databases={shlex.quote(storage_loc)}"
+    )
+    with _progress("Copying", status), tempfile.TemporaryFile() as backup_err:
+        backup_proc = subprocess.Popen(
+            ["ssh"] + _SSH_OPTIONS + _ssh_control_args(storage_host) + [storage_host, remote_cmd],
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=backup_err,
+            pipesize=_IO_CHUNK,
+        )
+        extract = subprocess.run(["mbstream", "-x", "-C", str(backup_dir)],
+                                 stdin=backup_proc.stdout, stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.PIPE)
+        backup_proc.stdout.close()
+        if backup_proc.wait() != 0:
+            backup_err.seek(0)
+            raise RuntimeError(f"mariabackup failed on {storage_host}:\n"
+                               f"{backup_err.read().decode(errors='replace')[-4000:]}")
+        if extract.returncode != 0:
+            raise RuntimeError(f"mbstream failed:\n{extract.stderr.decode(errors='replace')}")
+    
+    # --export writes the .cfg files IMPORT TABLESPACE checks the tables against
+    result = subprocess.run(
+        ["mariabackup", "--prepare", "--export", f"--target-dir={backup_dir}"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"mariabackup --prepare failed:\n{result.stderr.decode(errors='replace')[-4000:]}")
+    print(f"  ✓ Backup copied and prepared in {format_time(time.time() - start_time)}")
+    
+    # Table definitions (plus routines, triggers, events) from the source
+    socket_path, mysql_base, import_cmd, _ = _prepare_local_import(cfg)
+    schema = subprocess.run(
+        _remote_mysql_args(cfg, "mysqldump") + [
+            "--no-data", "--single-transaction", "--skip-lock-tables",
+            "--routines", "--triggers", "--events", "--default-character-set=utf8mb4",
+            storage_loc,
+        ],
+        capture_output=True
+    )
+    if schema.returncode != 0:
+        raise RuntimeError(f"Schema dump failed:\n{schema.stderr.decode(errors='replace')}")
+    result = subprocess.run(import_cmd, input=_IMPORT_PRELUDE + schema.stdout + _IMPORT_POSTLUDE,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise RuntimeError(f"Schema import failed into local DB {storage_loc}:\n"
+                           f"{result.stderr.decode(errors='replace')}")
+    
+    # Swap the tablespaces in: all DISCARDs, copy the files, all IMPORTs
+    mysql_admin = _local_mysql_admin_base_args(socket_path or None)
+    result = subprocess.run(mysql_admin + ["-N", "-e", "SELECT @@datadir;"], capture_output=True, text=True)
+    if result.returncode != 0 or not result.stdout.strip():
+        raise RuntimeError(f"Could not read the local datadir: {result.stderr.strip()}")
+    db_dir = Path(result.stdout.strip()) / storage_loc
+    owner = db_dir.stat()
+    
+    tables = sorted(engines)
+    
+    def alter_all(action: str) -> None:
+        sql = "SET foreign_key_checks=0;\n" + "".join(
+            f"ALTER TABLE `{storage_loc}`.`{t}` {action} TABLESPACE;\n" for t in tables
+        )
+        result = _run_sql(mysql_admin, sql)
+        if result.returncode != 0:
+            raise RuntimeError(f"{action} TABLESPACE failed in local DB {storage_loc}:\n{result.stderr}")
+    
+    print(f"Importing {len(tables)} tablespaces into the local database ...")
+    try:
+        alter_all("DISCARD")
+        for table in tables:
+            for suffix in (".ibd", ".cfg"):
+                target = db_dir / f"{table}{suffix}"
+                shutil.copyfile(backup_dir / storage_loc / f"{table}{suffix}", target)
+                os.chown(target, owner.st_uid, owner.st_gid)
+        alter_all("IMPORT")
+    except (OSError, RuntimeError) as e:
+        # Tables whose tablespace was discarded but not imported are unusable;
+        # drop the database so the logical dump starts from a clean one
+        print(f"  ⚠ Tablespace import failed: {e}")
+        drop_sql = f"DROP DATABASE IF EXISTS `{storage_loc}`;"
+        result = _run_sql(mysql_admin, drop_sql)
+        if result.returncode != 0:
+            # Copied files that were never imported keep the server from
+            # removing the directory
+            for table in tables:
+                for suffix in (".ibd", ".cfg"):
+                    (db_dir / f"{table}{suffix}").unlink(missing_ok=True)
+            result = _run_sql(mysql_admin, drop_sql)
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"Could not drop the partly imported local DB {storage_loc}: {result.stderr.strip()}\n"
+                f"    Run: mysql -e 'DROP DATABASE `{storage_loc}`;' and rerun without --physical"
+            )
+        print(f"  ✓ Dropped the partly imported local DB {storage_loc}")
+        return False
+    # The .cfg files are only read by IMPORT TABLESPACE
+    for table in tables:
+        (db_dir / f"{table}.cfg").unlink(missing_ok=True)
+    
+    elapsed = time.time() - start_time
+    final_table_count = get_local_table_count(storage_loc, mysql_base)
+    print(f"  ✓ Import completed: {final_table_count} tables in {format_time(elapsed)}")
+    
+    grant_local_db_user(cfg, socket_path)
+    return True
+
+
 def start_slurmdbd_services():
     """Start slurmdbd services on nodes with slurmaccounting role via cmsh."""
     print("\nStarting slurmdbd services...")
     
-    cmsh_path = "/cm/local/apps/cmd/bin/cmsh"
     try:
         result = subprocess.run(
-            [cmsh_path, '-c', 'device; foreach -l slurmaccounting (services; start slurmdbd)'],
-            capture_output=True,
+            [_CMSH_PATH, '-c', 'device; foreach -l slurmaccounting (services; start slurmdbd)'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
             text=True,
             timeout=60
         )
@@ -1684,7 +3679,23 @@ def start_slurmdbd_services():
         return False
 
 
-def ensure_slurmdbd_dropin(primary_headnode: str, secondary_headnode: str) -> bool:
+_SLURMDBD_DROPIN_DIR = "/etc/systemd/system/slurmdbd.service.d"
+_SLURMDBD_DROPIN_FILE = f"{_SLURMDBD_DROPIN_DIR}/99-cmd.conf"
+
+
+def slurmdbd_dropin_exists(node: str, local_hostname: str) -> bool:
+    """Check whether the slurmdbd systemd drop-in file exists on a head node."""
+    if node == local_hostname:
+        return os.path.exists(_SLURMDBD_DROPIN_FILE)
+    try:
+        result = run_ssh(node, f"test -f {_SLURMDBD_DROPIN_FILE}", timeout=10, capture=False)
+    except subprocess.TimeoutExpired:
+        return False
+    return result.returncode == 0
+
+
+def ensure_slurmdbd_dropin(primary_headnode: str, secondary_headnode: str,
+                           prefetched: dict | None = None) -> bool:
     """Ensure the slurmdbd systemd drop-in file exists on both head nodes.
     
     The drop-in file clears the ConditionPathExists check that would otherwise
@@ -1694,29 +3705,29 @@ def ensure_slurmdbd_dropin(primary_headnode: str, secondary_headnode: str) -> bo
     Args:
         primary_headnode: Hostname of the primary BCM head node
         secondary_headnode: Hostname of the secondary BCM head node (can be None)
+        prefetched: Optional {node: exists} results of slurmdbd_dropin_exists()
         
     Returns:
         True if drop-in file exists/created on all head nodes
     """
-    print(f"\n{'=' * 65}")
+    print(f"\n{_SEP}")
     print("CHECKING SLURMDBD SYSTEMD DROP-IN FILE")
-    print('=' * 65)
+    print(_SEP)
     
-    dropin_dir = "/etc/systemd/system/slurmdbd.service.d"
-    dropin_file = f"{dropin_dir}/99-cmd.conf"
+    dropin_dir = _SLURMDBD_DROPIN_DIR
+    dropin_file = _SLURMDBD_DROPIN_FILE
     dropin_content = """[Unit]
 ConditionPathExists=
 [Service]
 Environment=SLURM_CONF=/cm/shared/apps/slurm/var/etc/slurm/slurm.conf
 """
+    prefetched = prefetched or {}
     
     nodes_to_check = [primary_headnode]
     if secondary_headnode:
         nodes_to_check.append(secondary_headnode)
     
-    local_hostname = subprocess.run(
-        ["hostname", "-s"], capture_output=True, text=True
-    ).stdout.strip()
+    local_hostname = get_local_short_hostname()
     
     all_success = True
     
@@ -1724,16 +3735,10 @@ Environment=SLURM_CONF=/cm/shared/apps/slurm/var/etc/slurm/slurm.conf
         is_local = (node == local_hostname)
         print(f"\n  Checking {node}{'  (local)' if is_local else ''}...")
         
-        # Check if drop-in file exists
-        if is_local:
-            file_exists = os.path.exists(dropin_file)
-        else:
-            result = subprocess.run(
-                ["ssh", "-o", "ConnectTimeout=5", "-o", "StrictHostKeyChecking=no",
-                 node, f"test -f {dropin_file}"],
-                capture_output=True, text=True, timeout=10
-            )
-            file_exists = (result.returncode == 0)
+        # Check if drop-in file exists. A prefetched "exists" is final; a
+        # prefetched "missing" is re-checked because cmdaemon may have created
+        # the drop-in after the overlay update.
+        file_exists = prefetched.get(node) or slurmdbd_dropin_exists(node, local_hostname)
         
         if file_exists:
             print(f"    ✓ Drop-in file already exists: {dropin_file}")
@@ -1752,20 +3757,17 @@ Environment=SLURM_CONF=/cm/shared/apps/slurm/var/etc/slurm/slurm.conf
                 print(f"    ✓ Created drop-in file and reloaded systemd")
             else:
                 # Create via SSH
+                # The && list continues on the heredoc's command line
                 create_cmd = (
                     f"mkdir -p {dropin_dir} && "
-                    f"cat > {dropin_file} << 'EOF'\n{dropin_content}EOF\n"
-                    f"&& systemctl daemon-reload"
-                )
-                result = subprocess.run(
-                    ["ssh", "-o", "ConnectTimeout=5", "-o", "StrictHostKeyChecking=no",
-                     node, create_cmd],
-                    capture_output=True, text=True, timeout=30
+                    f"cat > {dropin_file} << 'EOF' && systemctl daemon-reload\n"
+                    f"{dropin_content}EOF\n"
                 )
+                result = run_ssh(node, create_cmd, timeout=30)
                 if result.returncode == 0:
                     print(f"    ✓ Created drop-in file and reloaded systemd on {node}")
                 else:
-                    print(f"    ✗ Failed to create drop-in file on {node}: {result.stderr}")
+                    print(f"    ✗ Failed to create drop-in file on {node}: {result.stderr.decode(errors='replace')}")
                     all_success = False
         except Exception as e:
             print(f"    ✗ Error creating drop-in file on {node}: {e}")
@@ -1783,9 +3785,9 @@ def reupdate_primary_only():
     ensure_root()
     check_active_headnode()
     
-    print("=" * 65)
+    print(_SEP)
     print("RE-UPDATE SLURMACCOUNTING PRIMARY")
-    print("=" * 65)
+    print(_SEP)
     print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
     # Get current values
@@ -1816,53 +3818,43 @@ def reupdate_primary_only():
     print(f"\nStopping cmdaemon...")
     result = subprocess.run(
         ["systemctl", "stop", "cmd"],
-        capture_output=True, text=True, timeout=60
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=60
     )
     if result.returncode == 0:
         print(f"  ✓ cmdaemon stopped")
-        time.sleep(2)
+        if not _wait_for_cmdaemon(running=False):
+            print(f"  ⚠ Warning: cmdaemon still running after {_CMD_WAIT_TIMEOUT}s")
     else:
         print(f"  ⚠ Warning: Could not stop cmdaemon: {result.stderr}")
     
     # Update database
     print(f"\nUpdating slurmaccounting primary in cmdaemon database...")
-    update_sql = (
-        f"UPDATE Roles SET extra_values='{{\"ha\":true,\"primary\":\"{primary_headnode}\"}}' "
-        f"WHERE CAST(name AS CHAR)='slurmaccounting'"
-    )
-    result = subprocess.run(
-        ["mysql", "cmdaemon", "-e", update_sql],
-        capture_output=True, text=True
-    )
-    if result.returncode != 0:
-        print(f"  ✗ Failed to update: {result.stderr}")
+    ok, rows, current_value, error = set_accounting_primary(primary_headnode)
+    if not ok:
+        print(f"  ✗ Failed to update: {error}")
         # Try to start cmdaemon anyway
         subprocess.run(["systemctl", "start", "cmd"], timeout=60)
         sys.exit(1)
     
-    print(f"  ✓ Updated slurmaccounting primary={primary_headnode}")
-    
-    # Verify
-    result = subprocess.run(
-        ["mysql", "-N", "cmdaemon", "-e", verify_sql],
-        capture_output=True, text=True
-    )
-    if result.returncode == 0:
-        current_value = result.stdout.strip()
-        if primary_headnode in current_value:
-            print(f"  ✓ Verified: {current_value}")
-        else:
-            print(f"  ⚠ Warning: Unexpected value: {current_value}")
+    if rows:
+        print(f"  ✓ Updated slurmaccounting primary={primary_headnode}")
+    else:
+        print(f"  ✓ slurmaccounting primary was already {primary_headnode}")
+    if primary_headnode in current_value:
+        print(f"  ✓ Verified: {current_value}")
+    else:
+        print(f"  ⚠ Warning: Unexpected value: {current_value}")
     
     # Start cmdaemon
     print(f"\nStarting cmdaemon...")
     result = subprocess.run(
         ["systemctl", "start", "cmd"],
-        capture_output=True, text=True, timeout=60
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=60
     )
     if result.returncode == 0:
         print(f"  ✓ cmdaemon started")
-        time.sleep(3)
+        if not _wait_for_cmdaemon(running=True):
+            print(f"  ⚠ Warning: cmdaemon not answering cmsh after {_CMD_WAIT_TIMEOUT}s")
     else:
         print(f"  ⚠ Warning: Could not start cmdaemon: {result.stderr}")
     
@@ -1870,7 +3862,7 @@ def reupdate_primary_only():
     print(f"\nVerifying via cmsh...")
     try:
         cmsh_result = subprocess.run(
-            ["/cm/local/apps/cmd/bin/cmsh", "-c",
+            [_CMSH_PATH, "-c",
              "configurationoverlay; use slurm-accounting; roles; use slurmaccounting; get primary"],
             capture_output=True, text=True, timeout=30
         )
@@ -1882,9 +3874,9 @@ def reupdate_primary_only():
     # Also ensure drop-in files exist
     ensure_slurmdbd_dropin(primary_headnode, secondary_headnode)
     
-    print(f"\n{'=' * 65}")
+    print(f"\n{_SEP}")
     print("RE-UPDATE COMPLETE")
-    print('=' * 65)
+    print(_SEP)
     print("\nNext steps:")
     print("  1) Run 'cmha dbreclone <passive-node>' to sync cmdaemon database")
     print("  2) Restart slurmdbd: systemctl restart slurmdbd")
@@ -1904,9 +3896,9 @@ def rollback_migration(original_primary: str, original_backup: str = None):
     ensure_root()
     check_active_headnode()
     
-    print("=" * 65)
+    print(_SEP)
     print("ROLLBACK SLURM ACCOUNTING MIGRATION")
-    print("=" * 65)
+    print(_SEP)
     print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
     # Get current BCM head nodes for reference
@@ -1941,15 +3933,14 @@ def rollback_migration(original_primary: str, original_backup: str = None):
         sys.exit(0)
     
     # Stop slurmdbd on head nodes first
-    print(f"\n{'=' * 65}")
+    print(f"\n{_SEP}")
     print("STOPPING SLURMDBD SERVICES")
-    print('=' * 65)
+    print(_SEP)
     
-    cmsh_path = "/cm/local/apps/cmd/bin/cmsh"
     try:
         result = subprocess.run(
-            [cmsh_path, '-c', 'device; foreach -l slurmaccounting (services; stop slurmdbd)'],
-            capture_output=True, text=True, timeout=60
+            [_CMSH_PATH, '-c', _CMSH_STOP_SLURMDBD],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=60
         )
         if result.returncode == 0:
             print("  ✓ Stopped slurmdbd on all slurmaccounting nodes")
@@ -1961,53 +3952,44 @@ def rollback_migration(original_primary: str, original_backup: str = None):
     time.sleep(2)
     
     # Update cmdaemon database
-    print(f"\n{'=' * 65}")
+    print(f"\n{_SEP}")
     print("UPDATING CMDAEMON DATABASE")
-    print('=' * 65)
+    print(_SEP)
     
     print(f"\nStopping cmdaemon...")
     result = subprocess.run(
         ["systemctl", "stop", "cmd"],
-        capture_output=True, text=True, timeout=60
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=60
     )
     if result.returncode == 0:
         print(f"  ✓ cmdaemon stopped")
-        time.sleep(2)
+        if not _wait_for_cmdaemon(running=False):
+            print(f"  ⚠ Warning: cmdaemon still running after {_CMD_WAIT_TIMEOUT}s")
     else:
         print(f"  ⚠ Warning: Could not stop cmdaemon: {result.stderr}")
     
     # Update slurmaccounting primary
     print(f"\nUpdating slurmaccounting primary to: {original_primary}")
-    update_sql = (
-        f"UPDATE Roles SET extra_values='{{\"ha\":true,\"primary\":\"{original_primary}\"}}' "
-        f"WHERE CAST(name AS CHAR)='slurmaccounting'"
-    )
-    result = subprocess.run(
-        ["mysql", "cmdaemon", "-e", update_sql],
-        capture_output=True, text=True
-    )
-    if result.returncode != 0:
-        print(f"  ✗ Failed to update primary: {result.stderr}")
+    ok, rows, current_value, error = set_accounting_primary(original_primary)
+    if not ok:
+        print(f"  ✗ Failed to update primary: {error}")
     else:
-        print(f"  ✓ Updated slurmaccounting primary={original_primary}")
-    
-    # Verify
-    result = subprocess.run(
-        ["mysql", "-N", "cmdaemon", "-e", verify_sql],
-        capture_output=True, text=True
-    )
-    if result.returncode == 0:
-        print(f"  ✓ Verified: {result.stdout.strip()}")
+        if rows:
+            print(f"  ✓ Updated slurmaccounting primary={original_primary}")
+        else:
+            print(f"  ✓ slurmaccounting primary was already {original_primary}")
+        print(f"  ✓ Verified: {current_value}")
     
     # Start cmdaemon
     print(f"\nStarting cmdaemon...")
     result = subprocess.run(
         ["systemctl", "start", "cmd"],
-        capture_output=True, text=True, timeout=60
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=60
     )
     if result.returncode == 0:
         print(f"  ✓ cmdaemon started")
-        time.sleep(5)
+        if not _wait_for_cmdaemon(running=True):
+            print(f"  ⚠ Warning: cmdaemon not answering cmsh after {_CMD_WAIT_TIMEOUT}s")
     else:
         print(f"  ⚠ Warning: Could not start cmdaemon: {result.stderr}")
     
@@ -2030,8 +4012,8 @@ def rollback_migration(original_primary: str, original_backup: str = None):
         overlay_cmd = (f"configurationoverlay; use {overlay_name}; "
                        f"set allheadnodes no; set nodes {nodes_str}; commit")
         result = subprocess.run(
-            [cmsh_path, '-c', overlay_cmd],
-            capture_output=True, text=True, timeout=30
+            [_CMSH_PATH, '-c', overlay_cmd],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=30
         )
         if result.returncode == 0:
             print(f"  ✓ Updated overlay nodes={nodes_str}")
@@ -2043,8 +4025,8 @@ def rollback_migration(original_primary: str, original_backup: str = None):
         role_cmd = (f"configurationoverlay; use {overlay_name}; roles; use slurmaccounting; "
                     f"set storagehost {original_primary}; commit")
         result = subprocess.run(
-            [cmsh_path, '-c', role_cmd],
-            capture_output=True, text=True, timeout=30
+            [_CMSH_PATH, '-c', role_cmd],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=30
         )
         if result.returncode == 0:
             print(f"  ✓ Updated storagehost={original_primary}")
@@ -2055,23 +4037,141 @@ def rollback_migration(original_primary: str, original_backup: str = None):
         print(f"  ⚠ Error updating BCM configuration: {e}")
     
     # Final summary
-    print(f"\n{'=' * 65}")
-    print("ROLLBACK SUMMARY")
-    print('=' * 65)
+    lines = [
+        f"\n{_SEP}",
+        "ROLLBACK SUMMARY",
+        _SEP,
+        f"\n✓ BCM configuration reverted to use original Slurm controllers:",
+        f"    slurmaccounting primary: {original_primary}",
+        f"    slurmaccounting storagehost: {original_primary}",
+        f"\nNext steps:",
+        f"  1) Verify original Slurm controllers are running:",
+        f"       ssh {original_primary} 'systemctl status slurmdbd'",
+        f"  2) Sync cmdaemon database to passive BCM head node:",
+        f"       cmha dbreclone <passive-head-node>",
+        f"  3) Test Slurm accounting:",
+        f"       sacctmgr show cluster",
+        f"\n{_SEP}",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+def _run_check(cmd: list, timeout: int = 10) -> tuple:
+    """Run a read-only check command.
+    
+    Returns:
+        Tuple of (success, first line of output for display)
+    """
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return False, str(e)
+    output = (result.stdout.strip() or result.stderr.strip()).splitlines()
+    return result.returncode == 0 and bool(result.stdout.strip()), output[0] if output else ""
+
+
+def _check_replica_status() -> tuple | None:
+    """Check the local MySQL replication threads in one query.
+    
+    Returns:
+        Tuple of (success, detail), or None if replica status is not
+        available (no privilege, not a replica) and cmha should decide
+    """
+    mysql_base = _local_mysql_base_args(detect_mysql_socket() or None)
+    # SHOW REPLICA STATUS is MariaDB 10.5.1+ / MySQL 8.0.22+; older servers
+    # only know the SLAVE spelling
+    for stmt in ("SHOW REPLICA STATUS\\G", "SHOW SLAVE STATUS\\G"):
+        try:
+            result = subprocess.run(mysql_base + ["-e", stmt], capture_output=True, text=True, timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode == 0:
+            break
+    else:
+        return None
+    
+    status = {}
+    for line in result.stdout.splitlines():
+        key, sep, value = line.strip().partition(": ")
+        if sep:
+            status[key.replace("Slave", "Replica").replace("Master", "Source")] = value
+    if not status:
+        return None
+    
+    io_running = status.get("Replica_IO_Running")
+    sql_running = status.get("Replica_SQL_Running")
+    lag = status.get("Seconds_Behind_Source")
+    ok = io_running == "Yes" and sql_running == "Yes" and lag not in (None, "NULL")
+    return ok, f"IO={io_running} SQL={sql_running} lag={lag}s"
+
+
+def _check_mysql_ha() -> tuple:
+    """Check BCM MySQL HA health.
+    
+    Reads the replication threads straight from the local MySQL; only
+    falls back to 'cmha status' if replica status cannot be read.
+    """
+    replica = _check_replica_status()
+    if replica is not None:
+        return replica
     
-    print(f"\n✓ BCM configuration reverted to use original Slurm controllers:")
-    print(f"    slurmaccounting primary: {original_primary}")
-    print(f"    slurmaccounting storagehost: {original_primary}")
+    try:
+        result = subprocess.run(["cmha", "status"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return False, str(e)
+    if result.returncode != 0:
+        return False, result.stderr.strip() or f"exit code {result.returncode}"
+    failed = [line.strip() for line in result.stdout.splitlines() if "FAIL" in line.upper()]
+    return not failed, failed[0] if failed else "no failures reported"
+
+
+def _check_slurmdbd(node: str) -> tuple:
+    """Check that slurmdbd is active on a head node."""
+    if node == get_local_short_hostname():
+        return _run_check(["systemctl", "is-active", "slurmdbd"])
+    try:
+        active = _slurmdbd_is_active(node)
+        return active, "active" if active else "not active"
+    except subprocess.TimeoutExpired as e:
+        return False, str(e)
+
+
+def verify_migration() -> bool:
+    """Run the post-migration checks concurrently and print a result table.
     
-    print(f"\nNext steps:")
-    print(f"  1) Verify original Slurm controllers are running:")
-    print(f"       ssh {original_primary} 'systemctl status slurmdbd'")
-    print(f"  2) Sync cmdaemon database to passive BCM head node:")
-    print(f"       cmha dbreclone <passive-head-node>")
-    print(f"  3) Test Slurm accounting:")
-    print(f"       sacctmgr show cluster")
+    Checks MySQL HA replication, slurmdbd on each BCM head node, and that
+    sacctmgr can read clusters and accounts through slurmdbd. Intended to
+    be run after 'cmha dbreclone' and starting slurmdbd.
     
-    print(f"\n{'=' * 65}")
+    Returns:
+        True if every check passed
+    """
+    print(f"\n{_SEP}")
+    print("VERIFYING MIGRATION")
+    print(_SEP)
+    
+    sacctmgr = shutil.which("sacctmgr") or "/cm/shared/apps/slurm/current/bin/sacctmgr"
+    checks = {"MySQL HA replication": (_check_mysql_ha,)}
+    for node in get_bcm_headnodes():
+        if node:
+            checks[f"slurmdbd on {node}"] = (_check_slurmdbd, node)
+    checks["sacctmgr show cluster"] = (_run_check, [sacctmgr, "show", "cluster", "-n"])
+    checks["sacctmgr show account"] = (_run_check, [sacctmgr, "show", "account", "-n"])
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {name: executor.submit(*check) for name, check in checks.items()}
+        results = {name: future.result() for name, future in futures.items()}
+    
+    width = max(len(name) for name in results)
+    lines = [""]
+    for name, (ok, detail) in results.items():
+        lines.append(f"  {'✓' if ok else '✗'} {name:<{width}}  {detail}")
+    all_ok = all(ok for ok, _ in results.values())
+    lines.append("\n✓ All checks passed" if all_ok else "\n✗ Some checks failed")
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+    return all_ok
 
 
 def parse_arguments():
@@ -2084,9 +4184,18 @@ Examples:
   # Run full migration
   %(prog)s
 
+  # Run full migration using TSV export + mysqlimport
+  %(prog)s --fast
+
+  # Continue a migration that failed part-way through the import
+  %(prog)s --resume
+
   # Re-update only the slurmaccounting primary field
   %(prog)s --reupdate-primary
 
+  # Check HA, slurmdbd and accounting after 'cmha dbreclone' and starting slurmdbd
+  %(prog)s --verify
+
   # Rollback to original Slurm controllers
   %(prog)s --rollback --original-primary slurmctl-01 --original-backup slurmctl-02
 """
@@ -2104,6 +4213,65 @@ Examples:
         help='Rollback migration to use original Slurm controllers'
     )
     
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='Only run the post-migration checks (MySQL HA, slurmdbd on the head nodes, '
+             'sacctmgr); exits non-zero if any check fails'
+    )
+    
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        help='Export tables as TSV on the StorageHost (mysqldump --tab) and load them '
+             'with mysqlimport; falls back to a SQL dump if --tab is not permitted'
+    )
+    
+    parser.add_argument(
+        '--physical',
+        action='store_true',
+        help='Copy the InnoDB tablespaces with mariabackup instead of dumping SQL '
+             '(same MariaDB release on both sides); falls back to a SQL dump otherwise'
+    )
+    
+    parser.add_argument(
+        '--no-stream',
+        action='store_true',
+        help='Write the complete dump to disk before importing it, instead of '
+             'importing while dumping'
+    )
+    
+    parser.add_argument(
+        '--compress-transport',
+        choices=sorted(_TRANSPORT_CODECS),
+        help='Run mysqldump on the StorageHost and send its output compressed over SSH '
+             '(for slow links; implies mysqldump rather than mydumper)'
+    )
+    
+    parser.add_argument(
+        '--disable-redo-log',
+        action='store_true',
+        help='MySQL 8.0.21+ only: disable the InnoDB redo log of the local server during '
+             'the import. Server-wide: a crash meanwhile can leave the whole server, '
+             'cmdaemon database included, unable to start'
+    )
+    
+    parser.add_argument(
+        '--mydumper-threads',
+        type=int,
+        default=os.cpu_count() or 1,
+        metavar='N',
+        help='Threads for mydumper/myloader, which are used instead of mysqldump '
+             'when both are installed (default: number of CPUs)'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue an interrupted migration from /root/slurm-db-migration/checkpoint.json, '
+             'reusing its dump and skipping tables that were already imported'
+    )
+    
     parser.add_argument(
         '--original-primary',
         type=str,
@@ -2127,6 +4295,15 @@ Examples:
     if args.reupdate_primary and args.rollback:
         parser.error("Cannot use --reupdate-primary and --rollback together")
     
+    if args.verify and (args.reupdate_primary or args.rollback):
+        parser.error("--verify cannot be combined with --reupdate-primary or --rollback")
+    
+    if args.mydumper_threads < 1:
+        parser.error("--mydumper-threads must be at least 1")
+    
+    if args.resume and (args.reupdate_primary or args.rollback or args.verify):
+        parser.error("--resume only applies to a full migration")
+    
     return args
 
 
@@ -2142,13 +4319,16 @@ def main():
         rollback_migration(args.original_primary, args.original_backup)
         return
     
+    if args.verify:
+        sys.exit(0 if verify_migration() else 1)
+    
     # Normal migration flow
     ensure_root()
     check_active_headnode()
 
-    print("=" * 65)
+    print(_SEP)
     print("SLURM ACCOUNTING DATABASE MIGRATION TO BCM HEAD NODES")
-    print("=" * 65)
+    print(_SEP)
     print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
     # Find slurmdbd.conf
@@ -2169,7 +4349,7 @@ def main():
     preflight_local_mysql_admin()
 
     # Get local hostname and determine BCM head nodes
-    local_hostname = run_cmd(["hostname", "-s"], capture_output=True).stdout.strip()
+    local_hostname = get_local_short_hostname()
     primary_headnode, secondary_headnode = get_bcm_headnodes()
 
     print("\nCurrent Slurm accounting DB configuration (from slurmdbd.conf):")
@@ -2207,12 +4387,41 @@ def main():
 
     ts = datetime.now().strftime("%Y%m%d-%H%M%S")
     dump_dir = Path("/root/slurm-db-migration")
-    dump_path = dump_dir / f"slurm_acct_db-{ts}.sql"
+    codec = select_dump_codec()
+    dump_path = dump_dir / f"slurm_acct_db-{ts}.sql{codec['suffix'] if codec else ''}"
+
+    # A checkpoint is left behind by a run that failed after the dump;
+    # with --resume that dump is reused instead of taken again
+    checkpoint_path = dump_dir / _CHECKPOINT_FILE
+    checkpoint = load_checkpoint(checkpoint_path)
+    if checkpoint and not args.resume:
+        print(f"\nFound a checkpoint from an interrupted migration: {checkpoint_path}")
+        if not confirm_prompt("Discard it and start a new migration? [y/N]: "):
+            print("Aborting. Re-run with --resume to continue the interrupted migration.")
+            sys.exit(0)
+        checkpoint_path.unlink()
+        checkpoint = None
+    elif args.resume and not checkpoint:
+        print(f"\n⚠ No checkpoint found at {checkpoint_path}; starting a new migration")
+
+    resume_dump = None
+    if checkpoint and checkpoint.get("dump_path"):
+        resume_dump = Path(checkpoint["dump_path"])
+        if not resume_dump.exists():
+            print(f"\n⚠ Checkpointed dump {resume_dump} no longer exists; taking a new dump")
+            resume_dump = None
+    if resume_dump:
+        dump_path = resume_dump
+        codec_name = checkpoint.get("codec")
+        codec = dict(_DUMP_CODECS[codec_name], name=codec_name) if codec_name else None
+        checkpoint["resumed"] = True
+        save_checkpoint(checkpoint_path, checkpoint)
+        print(f"\nResuming from checkpoint, reusing dump: {dump_path}")
 
     # Step 0: Ensure database connectivity
-    print(f"\n{'=' * 65}")
+    print(f"\n{_SEP}")
     print("CHECKING DATABASE CONNECTIVITY")
-    print('=' * 65)
+    print(_SEP)
     
     if not ensure_db_connectivity(cfg):
         print("\nERROR: Cannot establish database connectivity. Aborting.", file=sys.stderr)
@@ -2228,23 +4437,74 @@ def main():
         print("\nERROR: Could not prepare for migration. Aborting.", file=sys.stderr)
         sys.exit(1)
 
+    # Steps 4 and 6 start by reading BCM and the head nodes, which does not
+    # depend on the database; do that in the background during the dump and
+    # import (this also brings up the ssh connection to the other head node)
+    background = ThreadPoolExecutor(max_workers=3)
+    bcm_config = background.submit(read_bcm_configuration)
+    dropin_checks = {
+        node: background.submit(slurmdbd_dropin_exists, node, local_hostname)
+        for node in (primary_headnode, secondary_headnode) if node
+    }
+    background.shutdown(wait=False)
+
     # Step 1-3: Database migration
-    print(f"\n{'=' * 65}")
+    print(f"\n{_SEP}")
     print("DATABASE MIGRATION")
-    print('=' * 65)
+    print(_SEP)
     
     try:
-        dump_remote_slurm_db(cfg, dump_path)
-        import_db_to_local(cfg, dump_path)
+        if checkpoint and checkpoint.get("imported"):
+            print("  Database import already completed by the interrupted run")
+        else:
+            with _bulk_load_mode(args.disable_redo_log):
+                if resume_dump and checkpoint.get("format") == "mydumper":
+                    import_mydumper_dir_to_local(cfg, dump_path, args.mydumper_threads)
+                elif resume_dump and resume_dump.is_dir():
+                    import_tab_dump_to_local(cfg, dump_path, checkpoint_path)
+                elif resume_dump:
+                    import_db_to_local(cfg, dump_path, codec)
+                else:
+                    tab_dir = dump_dir / f"slurm_acct_db-{ts}.tab"
+                    backup_dir = dump_dir / f"slurm_acct_db-{ts}.mariabackup"
+                    checkpoint = {"dump_path": None, "codec": None}
+                    if args.physical and migrate_via_mariabackup(cfg, backup_dir):
+                        dump_path = backup_dir
+                    elif args.fast and dump_remote_slurm_db_tab(cfg, tab_dir):
+                        dump_path = tab_dir
+                        checkpoint["dump_path"] = str(dump_path)
+                        save_checkpoint(checkpoint_path, checkpoint)
+                        import_tab_dump_to_local(cfg, tab_dir, checkpoint_path)
+                    else:
+                        if args.fast or args.physical:
+                            print("  Falling back to a regular SQL dump ...")
+                        if not args.no_stream and not args.compress_transport and mydumper_available():
+                            dump_path = dump_dir / f"slurm_acct_db-{ts}.mydumper"
+                            stream_remote_slurm_db_mydumper(cfg, dump_path, args.mydumper_threads,
+                                                            checkpoint_path)
+                        elif args.no_stream:
+                            dump_remote_slurm_db(cfg, dump_path, codec, args.compress_transport)
+                            checkpoint.update(dump_path=str(dump_path), codec=codec["name"] if codec else None)
+                            save_checkpoint(checkpoint_path, checkpoint)
+                            import_db_to_local(cfg, dump_path, codec)
+                        else:
+                            stream_remote_slurm_db_to_local(cfg, dump_path, codec, checkpoint_path,
+                                                            args.compress_transport)
+        checkpoint = load_checkpoint(checkpoint_path) or checkpoint
+        checkpoint["imported"] = True
+        save_checkpoint(checkpoint_path, checkpoint)
     except Exception as e:
         print(f"\nERROR during database migration: {e}", file=sys.stderr)
         print(f"Dump file (if created) is at: {dump_path}", file=sys.stderr)
+        if checkpoint_path.exists():
+            print(f"Re-run with --resume to continue from {checkpoint_path}", file=sys.stderr)
         sys.exit(1)
     
     print(f"\n✓ Database migration completed. Dump preserved at: {dump_path}")
 
     # Step 4: Update BCM configuration
-    bcm_updated = update_bcm_configuration(primary_headnode, skip_confirm=False)
+    bcm_updated = update_bcm_configuration(primary_headnode, skip_confirm=False,
+                                           prefetched=bcm_config.result())
     
     # Step 5: Update slurm.conf with correct accounting host settings
     # BCM's autogenerated section doesn't always set these correctly
@@ -2252,67 +4512,88 @@ def main():
     
     # Step 6: Ensure slurmdbd systemd drop-in file exists on both head nodes
     # This clears the ConditionPathExists check that would otherwise prevent slurmdbd from starting
-    dropin_ok = ensure_slurmdbd_dropin(primary_headnode, secondary_headnode)
+    dropin_ok = ensure_slurmdbd_dropin(
+        primary_headnode, secondary_headnode,
+        prefetched={node: check.result() for node, check in dropin_checks.items()},
+    )
+    
+    # Every step has run; a later --resume would have nothing to continue
+    checkpoint_path.unlink(missing_ok=True)
     
     # Note: We do NOT auto-restart slurmdbd here because cmha dbreclone 
     # needs to run first to sync the database to the passive head node
 
-    # Final summary
-    print(f"\n{'=' * 65}")
-    print("MIGRATION SUMMARY")
-    print('=' * 65)
-    
-    print(f"\n✓ Database migrated from {cfg['storage_host']} to {local_hostname}")
-    print(f"  Dump file: {dump_path}")
+    # Final summary, written in one go so it isn't interleaved or split
+    # into many small writes when the output is piped to tee or ssh
+    lines = [
+        f"\n{_SEP}",
+        "MIGRATION SUMMARY",
+        _SEP,
+        f"\n✓ Database migrated from {cfg['storage_host']} to {local_hostname}",
+        f"  Dump file: {dump_path}",
+    ]
     
     if bcm_updated:
-        print(f"\n✓ BCM configuration updated:")
-        print(f"    slurmaccounting storagehost: master")
-        print(f"    overlay allheadnodes: yes")
+        lines += [
+            f"\n✓ BCM configuration updated:",
+            f"    slurmaccounting storagehost: master",
+            f"    overlay allheadnodes: yes",
+        ]
     else:
-        print(f"\n⚠ BCM configuration was NOT updated automatically.")
-        print("  You must manually update via cmsh:")
-        print(f"    cmsh -c 'configurationoverlay; use <overlay>; roles; use slurmaccounting; "
-              f"set storagehost master; commit'")
-        print(f"    cmsh -c 'configurationoverlay; use <overlay>; set nodes; set allheadnodes yes; commit'")
+        lines += [
+            f"\n⚠ BCM configuration was NOT updated automatically.",
+            "  You must manually update via cmsh:",
+            f"    cmsh -c 'configurationoverlay; use <overlay>; roles; use slurmaccounting; "
+            f"set storagehost master; commit'",
+            f"    cmsh -c 'configurationoverlay; use <overlay>; set nodes; set allheadnodes yes; commit'",
+        ]
     
     if slurm_conf_updated:
-        print(f"\n✓ slurm.conf updated:")
-        print(f"    AccountingStorageHost={primary_headnode}")
-        if secondary_headnode:
-            print(f"    AccountingStorageBackupHost={secondary_headnode}")
+        lines += [
+            f"\n✓ slurm.conf updated:",
+            f"    AccountingStorageHost={primary_headnode}",
+        ]
     else:
-        print(f"\n⚠ slurm.conf was NOT updated automatically.")
-        print("  You must manually edit /cm/shared/apps/slurm/var/etc/slurm/slurm.conf:")
-        print(f"    AccountingStorageHost={primary_headnode}")
-        if secondary_headnode:
-            print(f"    AccountingStorageBackupHost={secondary_headnode}")
+        lines += [
+            f"\n⚠ slurm.conf was NOT updated automatically.",
+            "  You must manually edit /cm/shared/apps/slurm/var/etc/slurm/slurm.conf:",
+            f"    AccountingStorageHost={primary_headnode}",
+        ]
+    if secondary_headnode:
+        lines.append(f"    AccountingStorageBackupHost={secondary_headnode}")
     
     if dropin_ok:
-        print(f"\n✓ slurmdbd systemd drop-in file configured on head nodes")
-        print(f"    /etc/systemd/system/slurmdbd.service.d/99-cmd.conf")
+        lines += [
+            f"\n✓ slurmdbd systemd drop-in file configured on head nodes",
+            f"    {_SLURMDBD_DROPIN_FILE}",
+        ]
     else:
-        print(f"\n⚠ slurmdbd systemd drop-in file may need manual setup.")
-        print("  Create /etc/systemd/system/slurmdbd.service.d/99-cmd.conf with:")
-        print("    [Unit]")
-        print("    ConditionPathExists=")
-        print("    [Service]")
-        print("    Environment=SLURM_CONF=/cm/shared/apps/slurm/var/etc/slurm/slurm.conf")
-    
-    print(f"\nNext steps (in order):")
-    print("  1) Verify MySQL HA is healthy:")
-    print("     cmha status")
-    print("  2) Sync database to the passive head node:")
-    print("     cmha dbreclone <passive-head-node>")
-    print("  3) Start slurmdbd services via cmsh:")
-    print("     cmsh -c \"device; foreach -l slurmaccounting (services; start slurmdbd)\"")
-    print("  4) Verify slurmdbd is running:")
-    print("     systemctl status slurmdbd")
-    print("  5) Test Slurm accounting:")
-    print("     sacctmgr show cluster")
-    print("     sacctmgr show account")
-    
-    print(f"\n{'=' * 65}")
+        lines += [
+            f"\n⚠ slurmdbd systemd drop-in file may need manual setup.",
+            f"  Create {_SLURMDBD_DROPIN_FILE} with:",
+            "    [Unit]",
+            "    ConditionPathExists=",
+            "    [Service]",
+            "    Environment=SLURM_CONF=/cm/shared/apps/slurm/var/etc/slurm/slurm.conf",
+        ]
+    
+    lines += [
+        f"\nNext steps (in order):",
+        "  1) Verify MySQL HA is healthy:",
+        "     cmha status",
+        "  2) Sync database to the passive head node:",
+        "     cmha dbreclone <passive-head-node>",
+        "  3) Start slurmdbd services via cmsh:",
+        "     cmsh -c \"device; foreach -l slurmaccounting (services; start slurmdbd)\"",
+        "  4) Verify HA, slurmdbd and Slurm accounting in one go:",
+        f"     {sys.argv[0]} --verify",
+        "     (checks: local SHOW REPLICA/SLAVE STATUS, or cmha status if that cannot be read;",
+        "      systemctl is-active slurmdbd on each head node; sacctmgr show cluster;",
+        "      sacctmgr show account)",
+        f"\n{_SEP}",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":